@@ -1,6 +1,9 @@
 
 from log import Log
 from run import run
+from run import runMany
+from run import setDefaultLog
+from run import getDefaultLog
 from command import Command
 from command import Argument
 from setup import SetupMode
@@ -18,6 +18,8 @@ from xfrm import TransformUtils
 from item import ItemUtils
 from message import Message
 from setup import SetupMode
+from select import ItemSelection
+from select import SelectionMode
 from run import run
 
 
@@ -592,15 +594,16 @@ class Command(lxu.command.BasicCommand):
         bool, None
             Return False to exit command with ABORT message code.
         """
-        scene = modo.Scene()
-
         self.executeStart()
 
         if self.dropToolPre():
             run('!tool.drop')
 
         if self.restoreItemSelection():
-            selection = scene.selected
+            # Raw items are all that is needed to restore the selection
+            # afterwards, skip wrapping every selected item in modo.Item.
+            itemSelection = ItemSelection()
+            selection = itemSelection.getRaw()
 
         setupMode = SetupMode()
         if self.restoreSetupMode():
@@ -624,7 +627,7 @@ class Command(lxu.command.BasicCommand):
             TransformUtils.applyEdit()
                 
         if self.restoreItemSelection():
-            scene.select(selection, add=False)
+            itemSelection.set(selection, SelectionMode.REPLACE)
 
         if self.restoreSetupMode():
             setupMode.restore()
@@ -27,15 +27,17 @@ class DeformersStack(object):
             treeItems.append(rootItem)
         
         queue = rootItem.itemGraph(GRAPH_DEFORM_TREE).reverse()
-        
+
         while queue and len(queue) > 0:
             # The 0 index for pop() is crucial to get hierarchy that is in right order!
             # Or at least in the order in which it appears in deformers list.
             i = queue.pop(0)
             treeItems.append(i)
-            subItems = i.itemGraph(GRAPH_DEFORM_TREE).reverse()
-            if subItems and len(subItems) > 0:
-                queue += subItems
+            # Most tree nodes are leaves so probe the cheap reverse link count
+            # first to avoid materializing an empty children list.
+            subGraph = i.itemGraph(GRAPH_DEFORM_TREE)
+            if subGraph._graph.RevCount(subGraph._item) > 0:
+                queue += subGraph.reverse()
         
         return treeItems
 
@@ -51,15 +53,15 @@ class DeformersStack(object):
                 break
         
             try:
-                item = graph.forward(0)
+                nextItem = graph.forward(0)
             except LookupError:
                 break
-    
-            if item == modoRootItem:
+
+            if nextItem == modoRootItem:
                 result = True
                 break
-    
-            modoItem = item
+
+            modoItem = nextItem
             
         return result
 
@@ -74,11 +76,11 @@ class DeformersStack(object):
         graph = modoItem.itemGraph(GRAPH_DEFORM_TREE)
     
         try:
-            item = graph.forward(0)
+            parentItem = graph.forward(0)
         except LookupError:
             return None
 
-        return item
+        return parentItem
 
     @classmethod
     def setParent(cls, modoItem, parentModoItem):
@@ -180,8 +182,10 @@ class Effector(object):
         -------
         bool
         """
-        if self.generalInfluences:
-            return True
+        graph = lx.object.ItemGraph(self._item.Context().GraphLookup(GRAPH_DEFORMERS))
+        for x in xrange(graph.FwdCount(self._item)):
+            if modo.Item(graph.FwdByIndex(self._item, x)).type == 'genInfluence':
+                return True
         return False
 
     @property
@@ -8,6 +8,13 @@ from channel import ChannelUtils
 from run import run
 
 
+try:
+    _INT_TYPES = (int, long)
+except NameError:
+    # Python 3, long is folded into int.
+    _INT_TYPES = (int,)
+
+
 class DynamicParentSetup(object):
     """ This class allows for setting up dynamic parenting.
     
@@ -26,7 +33,7 @@ class DynamicParentSetup(object):
         parenting setup.
     """
 
-    DYNA_PARENT_CHANNELS = [
+    DYNA_PARENT_CHANNELS = (
         'parent',
         'offsetPos.X',
         'offsetPos.Y',
@@ -36,9 +43,14 @@ class DynamicParentSetup(object):
         'offsetRot.Z',
         'offsetScl.X',
         'offsetScl.Y',
-        'offsetScl.Z']
+        'offsetScl.Z')
+
+    DEFAULT_OFFSET = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0)
 
-    DEFAULT_OFFSET = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+    # Compensation offsets memoized by parent item and its world matrix values.
+    # Keying on matrix content means the cache can never serve a stale result.
+    _offsetCache = {}
+    _OFFSET_CACHE_LIMIT = 128
 
     @classmethod
     def new(cls, childItem, parentItem=None, name=None, compensation=True):
@@ -66,7 +78,7 @@ class DynamicParentSetup(object):
             offset = cls._calculateCompensationOffset(childItem, parentItem)
 
         dynaParent = cls._addDynamicParentModifier(childItem, name)
-        newSetup = cls(childItem)
+        newSetup = cls._fromModifier(childItem, dynaParent)
         newSetup._setDynamicParentRestValues()
 
         if parentItem is not None:
@@ -116,10 +128,12 @@ class DynamicParentSetup(object):
         if matrixCompose is None:
             return False
         
-        chanTo = self._dynaParent.channel('matrixInput')
+        chanTo = self._channel('matrixInput')
         chanFrom = matrixCompose.channel('matrixOutput')
         chanFrom >> chanTo
-        
+        self._composeCache = None # new link, cached compose list is stale now
+
+
         # When the connection is made we also change parent to new one.
         # Remember that parent 0 is world.
         # So parent indexes start from 1, link 0 is parent 1, link 1 is parent 2, etc.
@@ -159,7 +173,7 @@ class DynamicParentSetup(object):
         key : bool
             Whether to keyframe parent change, not relevant in setup mode.
         """
-        if type(itemOrIndex) in (int, long):
+        if isinstance(itemOrIndex, _INT_TYPES):
             index = itemOrIndex
             
             if index < 1:
@@ -179,7 +193,7 @@ class DynamicParentSetup(object):
         else:
             offset = self.DEFAULT_OFFSET
 
-        self._applyDynamicParentSetupValues(self._dynaParent, index, offset, action)
+        self._applyDynamicParentSetupValues(self._dynaParent, index, offset, action, time, key)
 
     def getParentItem(self, index):
         """ Gets parent item at a given index.
@@ -227,12 +241,11 @@ class DynamicParentSetup(object):
         LookupError
             When parent cannot be found.
         """
-        # TODO: Add reading this channel for specific action!
-        parentCount = self._dynaParent.channel('parent').get()
-        for x in xrange(parentCount):
-            index = x + 1 # remember about counting parent indexes from 1
-            parentItem = self.getParentItem(index) 
-            if parentItem == modoItem:
+        targetIdent = modoItem.id
+        # Remember about counting parent indexes from 1!
+        for index, composeModifier in enumerate(self._getMatrixComposeList(), 1):
+            parentItem = self._getParentItemFromMatrixCompose(composeModifier)
+            if parentItem is not None and parentItem.id == targetIdent:
                 return index
         raise LookupError
     
@@ -244,6 +257,7 @@ class DynamicParentSetup(object):
         setup the matrix compose is automatically removed by MODO.
         """
         run('!item.delete child:0 item:{%s}' % self._dynaParent.id)
+        self._composeCache = None
     
     @property
     def isFullSetup(self):
@@ -254,9 +268,7 @@ class DynamicParentSetup(object):
         """
         if not self._dynaParent:
             return False
-        if len(self.matrixComposerModifiers) > 0:
-            return True
-        return False
+        return self._channel('matrixInput').revCount > 0
 
     @property
     def animatedChannels(self):
@@ -270,7 +282,7 @@ class DynamicParentSetup(object):
         """        
         channels = []
         for chanName in self.DYNA_PARENT_CHANNELS:
-            channels.append(self._dynaParent.channel(chanName))
+            channels.append(self._channel(chanName))
         return channels
     
     @property
@@ -291,11 +303,7 @@ class DynamicParentSetup(object):
         -------
         list of modo.Item
         """
-        modifiers = []
-        inputChan = self._dynaParent.channel('matrixInput')
-        for x in xrange(inputChan.revCount):
-            modifiers.append(inputChan.reverse(x).item)
-        return modifiers
+        return list(self._getMatrixComposeList())
 
     def getMatrixComposeModifier(self, parentIndex):
         """ Gets matrix compose modifier for a given parent.
@@ -318,11 +326,11 @@ class DynamicParentSetup(object):
         """
         if parentIndex < 1:
             return None
-        inputChan = self._dynaParent.channel('matrixInput')
-        if parentIndex > inputChan.revCount:
+        composeModifiers = self._getMatrixComposeList()
+        if parentIndex > len(composeModifiers):
             raise IndexError
         linkIndex = parentIndex - 1
-        return inputChan.reverse(linkIndex).item
+        return composeModifiers[linkIndex]
 
     @property
     def setupItems(self):
@@ -334,15 +342,7 @@ class DynamicParentSetup(object):
         -------
         list of modo.Item
         """
-        setupItems = [self._dynaParent]
-        parentChan = self._dynaParent.channel('matrixInput')
-        parentCount = parentChan.revCount
-        if parentCount == 0:
-            return setupItems
-        
-        for x in xrange(parentCount):
-            setupItems.append(self.getMatrixComposeModifier(x + 1))
-        return setupItems
+        return [self._dynaParent] + self._getMatrixComposeList()
 
     @property
     def isAnimated(self):
@@ -354,8 +354,11 @@ class DynamicParentSetup(object):
         -------
         bool
         """
-        parentChan = self._dynaParent.channel('parent')
-        return parentChan.isAnimated
+        # The result is cached so UI bindings polling this property do not
+        # hit the SDK on every refresh. The setter invalidates the cache.
+        if self._isAnimatedCache is None:
+            self._isAnimatedCache = self._channel('parent').isAnimated
+        return self._isAnimatedCache
 
     @isAnimated.setter
     def isAnimated(self, state):
@@ -377,12 +380,13 @@ class DynamicParentSetup(object):
             run('!constraintParent.set 1 comp:true item:{%s}' % self._item.id)
         else:
             ChannelUtils.removeAnimation(self.animatedChannels)
+        self._isAnimatedCache = None
 
     @property
     def draw(self):
         # Note that when you get channel with hints you will get string hint
         # rather then the int value.
-        draw = self._dynaParent.channel('draw').get()
+        draw = self._channel('draw').get()
         if draw == 'off':
             return False
         return True
@@ -401,7 +405,7 @@ class DynamicParentSetup(object):
             draw = 0 # off
         else:
             draw = 2 # selected
-        self._dynaParent.channel('draw').set(draw, 0.0, False, lx.symbol.s_ACTIONLAYER_SETUP)
+        self._channel('draw').set(draw, 0.0, False, lx.symbol.s_ACTIONLAYER_SETUP)
         
     # -------- Private methods
 
@@ -442,13 +446,22 @@ class DynamicParentSetup(object):
         return dynaParent
 
     @classmethod
-    def _applyDynamicParentSetupValues(cls, dynaParentModoItem, index, offset, action):
+    def _applyDynamicParentSetupValues(cls, dynaParentModoItem, index, offset, action, time=None, key=False):
         """
         Applies a set of values defining dynamic parent setup.
+
+        Parameters
+        ----------
+        time : float, None
+            Time to set values at, None means current time.
+
+        key : bool
+            When True values are keyframed, not relevant on setup action.
         """
-        values = [index]
-        values.extend(offset)
+        values = (index,) + tuple(offset)
         actions = [action]
+        if time is None:
+            time = lx.service.Selection().GetTime()
 
         # Setting on setup action is a special case.
         # We don't want to create keys and want to be on time 0.0
@@ -458,16 +471,35 @@ class DynamicParentSetup(object):
         # reset them to setup but it can't be easily done via SDK and from setup mode.
         # For now we do this hack of copying setup values over to scene.
         if action == lx.symbol.s_ACTIONLAYER_SETUP:
-            key = False
             time = 0.0
-            dmod = DynamicParentModifier(dynaParentModoItem)
-            if not dmod.parentChannel.isAnimated:
+            key = False
+            if not dynaParentModoItem.channel('parent').isAnimated:
                 actions.append(lx.symbol.s_ACTIONLAYER_ANIM)
 
+        # Raw channel writes cannot create keys so keyed switches go
+        # through the TD SDK channel by channel.
+        if key:
+            for action in actions:
+                for chanName, value in zip(cls.DYNA_PARENT_CHANNELS, values):
+                    chan = dynaParentModoItem.channel(chanName)
+                    chan.set(value, time=time, key=True, action=action)
+            return
+
+        # All values for one action go through a single channel write object.
+        # This way MODO sees the parent switch as one transaction rather then
+        # a separate write with its own notification for every channel.
+        rawItem = dynaParentModoItem.internalItem
+        scene = lx.object.Scene(rawItem.Context())
+        # Channel indices are resolved once and zipped with their values
+        # so the per-action loop is free of name lookups and index arithmetic.
+        parentChanIndex = rawItem.ChannelLookup(cls.DYNA_PARENT_CHANNELS[0])
+        offsetPairs = [(rawItem.ChannelLookup(chanName), value)
+                       for chanName, value in zip(cls.DYNA_PARENT_CHANNELS[1:], values[1:])]
         for action in actions:
-            for x in xrange(len(cls.DYNA_PARENT_CHANNELS)):
-                chan = dynaParentModoItem.channel(cls.DYNA_PARENT_CHANNELS[x])
-                chan.set(values[x], time=time, key=key, action=action)
+            chanWrite = lx.object.ChannelWrite(scene.Channels(action, time))
+            chanWrite.Integer(rawItem, parentChanIndex, int(values[0]))
+            for chanIndex, value in offsetPairs:
+                chanWrite.Double(rawItem, chanIndex, value)
 
     @classmethod
     def _addMatrixCompose(self, parentItem):
@@ -533,32 +565,40 @@ class DynamicParentSetup(object):
 
         Returns
         -------
-        list of 9 floats that constitute the offset:
+        tuple of 9 floats that constitute the offset:
            3 floats for position,
            3 floats for rotation angles in radians,
            3 floats for scale.
         """
-        childLocalXfrm = modox.LocatorUtils.getItemLocalTransform(childItem)  # m4
-
-        if parentItem is not None:
-            parentWorldXfrm = modox.LocatorUtils.getItemWorldTransform(parentItem)  # m4
-        else:
-            parentWorldXfrm = modo.Matrix4()
+        if parentItem is None:
+            # World space parent, there is no transform to compensate for.
+            return cls.DEFAULT_OFFSET
 
         # Offset world is the world transform of child item as parented to new parent
-        # without any compensation.
-        # We need to invert this matrix and multiply child target world transform by this
-        # inverted offset - this gives us the offset from new parent need to get child
-        # item to its original world transform.
-        offsetWorld = parentWorldXfrm * childLocalXfrm
-        invOffsetWorld = offsetWorld.inverted()
-        offsetMtx = childLocalXfrm * invOffsetWorld
-
-        offsetValues = []
-        offsetValues.extend(offsetMtx.position) 
-        offsetValues.extend(offsetMtx.asEuler(degrees=False, order='xyz'))
-        offsetValues.extend(offsetMtx.scale().values)  # scale returns modo.Vector3 for some reason
+        # without any compensation:
+        #     offsetWorld = parentWorldXfrm * childLocalXfrm
+        # The offset is child local transform multiplied by inverted offset world.
+        # The child local transform cancels out in that product:
+        #     offsetMtx = childLocalXfrm * offsetWorld.inverted() = parentWorldXfrm.inverted()
+        # so the parent world inverse is computed directly, skipping two matrix
+        # multiplications and the child local transform query entirely.
+        parentWorldXfrm = modox.LocatorUtils.getItemWorldTransform(parentItem)  # m4
+
+        cacheKey = (parentItem.id, tuple(tuple(row) for row in parentWorldXfrm.m))
+        try:
+            return cls._offsetCache[cacheKey]
+        except KeyError:
+            pass
+
+        offsetMtx = parentWorldXfrm.inverted()
+
+        offsetValues = (tuple(offsetMtx.position)
+                        + tuple(offsetMtx.asEuler(degrees=False, order='xyz'))
+                        + tuple(offsetMtx.scale().values))  # scale returns modo.Vector3 for some reason
 
+        if len(cls._offsetCache) >= cls._OFFSET_CACHE_LIMIT:
+            cls._offsetCache.clear()
+        cls._offsetCache[cacheKey] = offsetValues
         return offsetValues
 
     def _fixParentConstraintInSetup(self):
@@ -586,12 +626,63 @@ class DynamicParentSetup(object):
             lx.eval('!channel.clear channel:{%s:%s}' % (parentConstraint.id, channelName))
             channel.set(value, 0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP)
 
+    def _getMatrixComposeList(self):
+        """ Gets matrix compose modifiers linked to the dynamic parent modifier.
+
+        The list is read from the matrixInput channel in a single pass and
+        cached until a new parent link is made or the setup is deleted.
+        Without the cache every parent lookup re-walks the reverse links,
+        one SDK call per link.
+
+        Returns
+        -------
+        list of modo.Item
+        """
+        if self._composeCache is None:
+            inputChan = self._channel('matrixInput')
+            self._composeCache = [inputChan.reverse(x).item for x in xrange(inputChan.revCount)]
+        return self._composeCache
+
+    def _channel(self, name):
+        """ Gets dynamic parent modifier channel by name.
+
+        Channel objects are cached so the SDK name lookup is paid
+        only once per channel per setup instance.
+
+        Returns
+        -------
+        modo.Channel
+        """
+        try:
+            return self._chanCache[name]
+        except KeyError:
+            chan = self._dynaParent.channel(name)
+            self._chanCache[name] = chan
+            return chan
+
+    @classmethod
+    def _fromModifier(cls, childItem, dynaParent):
+        """ Builds setup object from an already known dynamic parent modifier.
+
+        This skips the constraint graph walk that the standard constructor
+        performs to find the modifier.
+        """
+        setup = cls.__new__(cls)
+        setup._init(childItem, dynaParent)
+        return setup
+
+    def _init(self, childItem, dynaParent):
+        self._dynaParent = dynaParent
+        self._item = childItem
+        self._chanCache = {}
+        self._composeCache = None
+        self._isAnimatedCache = None
+
     def __init__(self, childItem):
         dynaParent = ItemUtils.getParentConstraintItem(childItem)
         if dynaParent is None:
             raise TypeError
-        self._dynaParent = dynaParent
-        self._item = childItem
+        self._init(childItem, dynaParent)
 
 
 class DynamicParentModifier(object):
@@ -640,7 +731,9 @@ class DynamicParentModifier(object):
         -------
         modo.Channel
         """
-        return self._item.channel('matrixInput')
+        if self._inputChan is None:
+            self._inputChan = self._item.channel('matrixInput')
+        return self._inputChan
 
     @property
     def parentChannel(self):
@@ -650,7 +743,9 @@ class DynamicParentModifier(object):
         -------
         modo.Channel
         """
-        return self._item.channel('parent')
+        if self._parentChan is None:
+            self._parentChan = self._item.channel('parent')
+        return self._parentChan
 
     def getParentIndex(self, time=None, action=lx.symbol.s_ACTIONLAYER_EDIT):
         """
@@ -769,4 +864,6 @@ class DynamicParentModifier(object):
         return keyTimes
 
     def __init__(self, modifierItem):
-        self._item = modifierItem
\ No newline at end of file
+        self._item = modifierItem
+        self._inputChan = None
+        self._parentChan = None
\ No newline at end of file
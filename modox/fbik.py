@@ -14,7 +14,7 @@ class FBIKSolver(object):
         
         Any value greater then 0 considers IK to be enabled.
         """
-        blendVal = self._modoItem.channel('iksIKFKBlend').get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        blendVal = self._blendChan.get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
         if blendVal > 0.0:
             return True
         else:
@@ -34,14 +34,14 @@ class FBIKSolver(object):
             blendVal = 1.0
         else:
             blendVal = 0.0
-        self._modoItem.channel('iksIKFKBlend').set(blendVal, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+        self._blendChan.set(blendVal, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
 
     def backupSetupBlend(self):
-        self._blendBkp = self._modoItem.channel('iksIKFKBlend').get(time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
-        
+        self._blendBkp = self._blendChan.get(time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+
     def restoreSetupBlend(self):
         try:
-            self._modoItem.channel('iksIKFKBlend').set(self._blendBkp, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+            self._blendChan.set(self._blendBkp, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
         except AttributeError:
             pass
 
@@ -49,6 +49,8 @@ class FBIKSolver(object):
 
     def __init__(self, modoItem):
         self._modoItem = modoItem
+        # Cached since the blend channel is hit by every enabled query.
+        self._blendChan = modoItem.channel('iksIKFKBlend')
 
 
 class FBIKChainItem(object):
@@ -1,10 +1,13 @@
 
 
+import weakref
+
 import lx
 import modo
 
 import const as c
 from run import run
+from run import getDefaultLog
 from locator import LocatorUtils
 from select import ItemSelection
 from select import SelectionMode
@@ -12,15 +15,31 @@ from select import SelectionMode
 
 class IKUtils(object):
 
+    # Last state set via disableIK/enableIK.
+    # None means the state was not touched yet and has to be set.
+    _ikDisabledState = None
+
+    _CMD_DISABLE = '!ik.disable 1'
+    _CMD_ENABLE = '!ik.disable 0'
+
     @classmethod
     def disableIK(cls):
         """
         Disables IK.
 
+        Redundant calls are skipped based on the last state set through
+        this class which also avoids the command failed log output the
+        toggle produces when there is nothing to do.
+
         Note that you'll get command failed log output when there are no ik solvers
-        in scene or you're not in setup mode.
+        in scene or you're not in setup mode. The state is only recorded
+        when the command actually succeeded so a failed call does not
+        make a later, valid one get skipped.
         """
-        run('!ik.disable 1')
+        if cls._ikDisabledState is True:
+            return
+        if cls._runIKToggle(cls._CMD_DISABLE):
+            cls._ikDisabledState = True
 
     @classmethod
     def enableIK(cls):
@@ -28,9 +47,58 @@ class IKUtils(object):
         Enables IK back.
 
         Note that you'll get command failed log output when there are no ik solvers
-        in scene or you're not in setup mode.
+        in scene or you're not in setup mode. The state is only recorded
+        when the command actually succeeded, see disableIK().
+        """
+        if cls._ikDisabledState is False:
+            return
+        if cls._runIKToggle(cls._CMD_ENABLE):
+            cls._ikDisabledState = False
+
+    @classmethod
+    def _runIKToggle(cls, cmdString):
+        """ Runs an ik.disable command reporting failures like run() does.
+
+        run() returns None for a void command whether it worked or not,
+        the toggle needs to know so the eval happens directly here.
+
+        Returns
+        -------
+        bool
+            True when the command succeeded.
+        """
+        try:
+            lx.eval(cmdString)
+        except RuntimeError, e:
+            log = getDefaultLog()
+            log.out('Command Failed: %s' % cmdString, log.MSG_ERROR)
+            log.startChildEntries()
+            log.out(e.message, log.MSG_ERROR)
+            log.stopChildEntries()
+            return False
+        return True
+
+    @classmethod
+    def canSwitch(cls, solverModoItem):
+        """
+        Tests whether IK/FK switch commands can run on a given solver item.
+
+        This is a cheap preflight that saves firing switch commands that
+        are bound to fail on items that are not standard IK solvers.
+
+        Parameters
+        ----------
+        solverModoItem : modo.Item
+
+        Returns
+        -------
+        bool
         """
-        run('!ik.disable 0')
+        if solverModoItem is None:
+            return False
+        if solverModoItem.type != c.ItemType.IK_23BAR_SOLVER:
+            return False
+        return solverModoItem.channel('blend') is not None
 
 
 class IKSwitchDirection(object):
@@ -56,7 +124,28 @@ class IK23BarSolver(object):
     TypeError
         When bad item was passed as initialiser.
     """
-    
+
+    # Solvers are instantiated per IK chain so rigs with many chains pay
+    # the per-instance dict for each one; slots keep instances small.
+    # The __weakref__ slot is required by the instance registry below.
+    __slots__ = ('__weakref__',
+                 '_modoItem',
+                 '_chanCache',
+                 '_switchChansCache',
+                 '_typeCache',
+                 '_blendVal',
+                 '_angleBiasVal',
+                 '_blendBkp',
+                 '_itemId',
+                 '_scanCmd',
+                 '_switchCmdTpl',
+                 '_resetCmd')
+
+    # Live solver wrappers keyed by item ident. Constructing a solver for
+    # an item that already has a live wrapper returns that wrapper so the
+    # channel, type and value caches survive repeated wrapping.
+    _instances = weakref.WeakValueDictionary()
+
     _SOLVER_ITEM_TYPE = c.ItemType.IK_23BAR_SOLVER
     _CHAN_BLEND = 'blend'
     _CHAN_ANGLE_BIAS = 'weightA'
@@ -78,11 +167,9 @@ class IK23BarSolver(object):
         
         Any value greater then 0 considers IK to be enabled.
         """
-        blendVal = self._modoItem.channel(self._CHAN_BLEND).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
-        if blendVal > 0.0:
-            return True
-        else:
-            return False
+        if self._blendVal is None:
+            self._blendVal = self._chan(self._CHAN_BLEND).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        return self._blendVal > 0.0
 
     @enabled.setter
     def enabled(self, state):
@@ -98,11 +185,14 @@ class IK23BarSolver(object):
             blendVal = 1.0
         else:
             blendVal = 0.0
-        self._modoItem.channel(self._CHAN_BLEND).set(blendVal, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+        self._chan(self._CHAN_BLEND).set(blendVal, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+        self._blendVal = blendVal
 
     @property
     def setupAngleBias(self):
-        return self._modoItem.channel(self._CHAN_SETUP_ANGLE_BIAS).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        if self._angleBiasVal is None:
+            self._angleBiasVal = self._chan(self._CHAN_SETUP_ANGLE_BIAS).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        return self._angleBiasVal
         
     @setupAngleBias.setter
     def setupAngleBias(self, value):
@@ -111,7 +201,8 @@ class IK23BarSolver(object):
         # DEV NOTE : It seems to be crucial to store the value on edit action and not setup!
         # Setting it straight to setup action did not work properly.
         # Find out why some day.
-        self._modoItem.channel(self._CHAN_SETUP_ANGLE_BIAS).set(value, time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        self._chan(self._CHAN_SETUP_ANGLE_BIAS).set(value, time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT)
+        self._angleBiasVal = value
         
     @property
     def modoItem(self):
@@ -132,7 +223,7 @@ class IK23BarSolver(object):
         -------
         modo.Item, None
         """
-        chan = self.modoItem.channel("goalWPos")
+        chan = self._chan("goalWPos")
         if chan is None:
             return None
         if chan.revCount == 0:
@@ -147,11 +238,16 @@ class IK23BarSolver(object):
         -------
         IK23BarSetup.Type.XXX
         """
-        try:
-            lowerInputChan = self.modoItem.channel(self._CHAN_LOWER_OUT).forward(0)
-        except LookupError:
-            return self.Type.BAR2
-        return self.Type.BAR3
+        # Setup type never changes for an existing solver so the graph
+        # probe is paid only on first access.
+        if self._typeCache is None:
+            try:
+                self._chan(self._CHAN_LOWER_OUT).forward(0)
+            except LookupError:
+                self._typeCache = self.Type.BAR2
+            else:
+                self._typeCache = self.Type.BAR3
+        return self._typeCache
 
     @property
     def switchKeyChannels(self):
@@ -162,24 +258,39 @@ class IK23BarSolver(object):
         -------
         [modo.Channel]
         """
-        if self.type == self.Type.BAR2:
-            chanNames = [self._CHAN_BLEND, self._CHAN_GLOBAL_ORIENT]
-        else:
-            chanNames = [self._CHAN_BLEND,
-                         self._CHAN_ANGLE_BIAS,
-                         self._CHAN_GLOBAL_ORIENT,
-                         self._CHAN_LOWER_ORIENT,
-                         self._CHAN_UPPER_ORIENT]
-        return [self.modoItem.channel(name) for name in chanNames]
+        # The channel set is a pure function of solver type which does not
+        # change once the setup is built so the list is resolved only once.
+        if self._switchChansCache is None:
+            if self.type == self.Type.BAR2:
+                chanNames = [self._CHAN_BLEND, self._CHAN_GLOBAL_ORIENT]
+            else:
+                chanNames = [self._CHAN_BLEND,
+                             self._CHAN_ANGLE_BIAS,
+                             self._CHAN_GLOBAL_ORIENT,
+                             self._CHAN_LOWER_ORIENT,
+                             self._CHAN_UPPER_ORIENT]
+            self._switchChansCache = [self._chan(name) for name in chanNames]
+        return self._switchChansCache
 
     def backupSetupBlend(self):
-        self._blendBkp = self._modoItem.channel(self._CHAN_BLEND).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
-        
+        self._blendBkp = self._chan(self._CHAN_BLEND).get(time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+
     def restoreSetupBlend(self):
         try:
-            self._modoItem.channel(self._CHAN_BLEND).set(self._blendBkp, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
+            self._chan(self._CHAN_BLEND).set(self._blendBkp, time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
         except AttributeError:
             pass
+        else:
+            self._blendVal = None
+
+    def invalidateCachedValues(self):
+        """ Drops cached blend and angle bias values.
+
+        Call this when solver channels were edited outside of this object
+        and cached values may no longer be valid.
+        """
+        self._blendVal = None
+        self._angleBiasVal = None
 
     def resetFromFK(self):
         """ Resets IK chain from FK Rest pose.
@@ -191,9 +302,11 @@ class IK23BarSolver(object):
         Updating the goal shouldn't be the issue so perhaps 2 bar update
         should be replaced with new command to. Need to test that.
         """
+        if not IKUtils.canSwitch(self._modoItem):
+            return
         if self.type == self.Type.BAR2:
             try:
-                lx.eval('!ik.apply Bar23 reset:true item:{%s} resetGoal:false' % self._modoItem.id)
+                lx.eval(self._resetCmd)
             except RuntimeError:
                 lx.out('Resetting 2 Bar IK failed!')
         else:
@@ -202,6 +315,8 @@ class IK23BarSolver(object):
                 lx.eval('!ik.updateRestPose mode:sel')
             except RuntimeError:
                 lx.out('Resetting 3 Bar IK failed!')
+        # The reset rewrites solver channels behind this object's back.
+        self.invalidateCachedValues()
 
     def switch(self, direction):
         """
@@ -213,11 +328,19 @@ class IK23BarSolver(object):
         direction : str
             One of IKFKSwitchDirection constants.
         """
+        if not IKUtils.canSwitch(self._modoItem):
+            return
+        # The preflight cannot predict every failure (locked channels,
+        # bad actor state) so the commands stay guarded like in
+        # resetFromFK().
         try:
-            lx.eval('!ik.scanIKFKChannels item:{%s} mode:setKey' % self.modoItem.id)
-            lx.eval('!ik.switchIKFK item:{%s} mode:{%s}' % (self.modoItem.id, direction))
+            lx.eval(self._scanCmd)
+            lx.eval(self._switchCmdTpl % direction)
         except RuntimeError:
-            pass
+            lx.out('IK/FK switch failed!')
+        # Switching keyframes blend and the other switch channels so any
+        # values cached on this object are stale now.
+        self.invalidateCachedValues()
 
     @property
     def hasUpVector(self):
@@ -228,8 +351,7 @@ class IK23BarSolver(object):
         -------
         bool
         """
-        chan = self._modoItem.channel('up')
-        return chan.revCount > 0
+        return self._getUp()[0]
 
     @property
     def upVectorItem(self):
@@ -241,10 +363,7 @@ class IK23BarSolver(object):
         modo.Item, None
             None is returned if no up transform is plugged into solver.
         """
-        chan = self._modoItem.channel('up')
-        if chan.revCount < 1:
-            return None
-        return chan.reverse(0).item
+        return self._getUp()[1]
 
     @upVectorItem.setter
     def upVectorItem(self, modoItem):
@@ -257,27 +376,80 @@ class IK23BarSolver(object):
             Up vector item or None to clear up transform connection from solver.
         """
         # Clear connection first.
-        chan = self._modoItem.channel('up')
+        chan = self._chan('up')
         if chan.revCount > 0:
             inputChan = chan.reverse(0)
             inputChan.deleteLink(chan)
 
         if modoItem is not None:
             chan = LocatorUtils.getItemWorldPositionMatrixChannel(modoItem)
-            chan >> self._modoItem.channel('up')
+            chan >> self._chan('up')
 
     # -------- Private methods
 
+    def _getUp(self):
+        """ Queries the up transform input with a single channel lookup.
+
+        Returns
+        -------
+        (bool, modo.Item or None)
+            Whether an up transform is plugged and the up vector item.
+        """
+        chan = self._chan('up')
+        if chan.revCount < 1:
+            return False, None
+        return True, chan.reverse(0).item
+
+    def _chan(self, name):
+        """ Gets solver channel by name, caching the resolved handle.
+
+        Returns
+        -------
+        modo.Channel
+        """
+        chan = self._chanCache.get(name)
+        if chan is None:
+            chan = self._modoItem.channel(name)
+            self._chanCache[name] = chan
+        return chan
+
+    def __new__(cls, modoItem):
+        try:
+            return cls._instances[modoItem.id]
+        except KeyError:
+            pass
+        solver = object.__new__(cls)
+        cls._instances[modoItem.id] = solver
+        return solver
+
     def __init__(self, modoItem):
+        try:
+            self._modoItem
+            return # reused instance from the registry, already initialised
+        except AttributeError:
+            pass
         if modoItem.type != self._SOLVER_ITEM_TYPE:
             raise TypeError
         self._modoItem = modoItem
+        self._chanCache = {}
+        self._switchChansCache = None
+        self._typeCache = None
+        self._blendVal = None
+        self._angleBiasVal = None
+        # The item ident never changes so switch command strings are
+        # formatted once up front rather then on every call.
+        self._itemId = modoItem.id
+        self._scanCmd = '!ik.scanIKFKChannels item:{%s} mode:setKey' % self._itemId
+        self._switchCmdTpl = '!ik.switchIKFK item:{%s} mode:{%%s}' % self._itemId
+        self._resetCmd = '!ik.apply Bar23 reset:true item:{%s} resetGoal:false' % self._itemId
 
 
 class IK23BarSetup(object):
     """ Represents entire IK setup.
     """
-    
+
+    __slots__ = ('_ikSolver',)
+
     _CHAN_UPPER_OUT = 'matrixOutput'
     _CHAN_MIDDLE_OUT = 'matrixOutput2'
     _CHAN_LOWER_OUT = 'matrixOutput7'
@@ -299,9 +471,12 @@ class IK23BarSetup(object):
         scene = modo.Scene()
         scene.select(items, add=False)
         lx.eval('ik.apply 1') # to apply 23bar ik.
-        items = scene.selected
-        solver = items[0]
-        goal = items[1]
+        # The command selects the solver first and the goal second.
+        # Only these two are needed so they are read straight from the
+        # selection service instead of materializing the full selection.
+        itemSelection = ItemSelection()
+        solver = modo.Item(itemSelection.getRawByIndex(0))
+        goal = modo.Item(itemSelection.getRawByIndex(1))
         return cls(solver)
         
     @property
@@ -314,18 +489,20 @@ class IK23BarSetup(object):
         -------
         [modo.Item]
         """
-        solverItem = self._ikSolver.modoItem
         chain = []
         channels = [self._CHAN_UPPER_OUT,
                     self._CHAN_MIDDLE_OUT,
                     self._CHAN_LOWER_OUT,
                     self._CHAN_END_OUT]
-        
-        for chan in channels:
-            try:
-                chain.append(solverItem.channel(chan).forward(0).item)
-            except LookupError:
+
+        # Probing the link count is cheaper then letting forward(0)
+        # raise LookupError on unplugged outputs (always the case for
+        # the lower output on 2 bar setups).
+        for chanName in channels:
+            chan = self._chan(chanName)
+            if chan is None or chan.fwdCount < 1:
                 continue
+            chain.append(chan.forward(0).item)
         return chain
         
     @property
@@ -357,7 +534,7 @@ class IK23BarSetup(object):
         modo.Item
         """
         try:
-            return self._ikSolver.modoItem.channel(self._CHAN_ROOT_IN).reverse(0).item
+            return self._chan(self._CHAN_ROOT_IN).reverse(0).item
         except LookupError:
             return None
         
@@ -367,11 +544,17 @@ class IK23BarSetup(object):
             lx.eval('!item.delete child:1 item:{%s}' % root.id)
 
     # -------- Private methods
-    
+
+    def _chan(self, name):
+        """ Gets solver item channel through the solver's channel cache.
+        """
+        return self._ikSolver._chan(name)
+
     def __init__(self, iksolver):
-        if not isinstance(iksolver, IK23BarSolver):
-            try:
-                iksolver = IK23BarSolver(iksolver)
-            except TypeError:
-                raise
+        # A solver wrapper is recognised by its _modoItem attribute.
+        # Anything else is treated as a raw solver item and promoted
+        # through the solver registry, which raises TypeError for items
+        # that are not IK solvers.
+        if getattr(iksolver, '_modoItem', None) is None:
+            iksolver = IK23BarSolver(iksolver)
         self._ikSolver = iksolver
\ No newline at end of file
@@ -4,6 +4,61 @@ import lx
 import modo
 
 
+# Constructing a service object is a nontrivial SDK call so the scene
+# service is cached once at import time and shared by the module.
+_sceneService = lx.service.Scene()
+
+# Command templates are built once at import so hot loops do not re-parse
+# the format string on every call.
+_CMD_MATCH_POS = '!item.match item pos average:false item:{%s} itemTo:{%s}'
+_CMD_MATCH_ROT = '!item.match item rot average:false item:{%s} itemTo:{%s}'
+_CMD_MATCH_SCL = '!item.match item scl average:false item:{%s} itemTo:{%s}'
+_CMD_CHAN_CREATE = '!channel.create "%s" %s item:{%s}'
+_CMD_CHAN_CREATE_USERNAME = '!channel.create "%s" %s item:{%s} username:{%s}'
+_CMD_ITEM_COMMAND = '!item.command add {%s} item:{%s}'
+
+_ACTIONLAYER_SETUP = lx.symbol.s_ACTIONLAYER_SETUP
+
+# The type code to root super type mapping is static within a session
+# so walks up the type chain are memoized here.
+_rootSuperTypeCache = {}
+
+
+def _rootSuperTypeForCode(typeCode):
+    """ Gets the topmost super type name for a given item type code.
+
+    Parameters
+    ----------
+    typeCode : int
+
+    Returns
+    -------
+    str, None
+        None is returned when the type has no super type.
+    """
+    try:
+        return _rootSuperTypeCache[typeCode]
+    except KeyError:
+        pass
+
+    itemTypeSuper = _sceneService.ItemTypeSuper
+    superType = typeCode
+    rootSuperType = None
+
+    while superType != 0:
+        superType = itemTypeSuper(superType)
+        if superType == 0:
+            break
+        rootSuperType = superType
+
+    if rootSuperType:
+        result = _sceneService.ItemTypeName(rootSuperType)
+    else:
+        result = None
+    _rootSuperTypeCache[typeCode] = result
+    return result
+
+
 class Item(modo.Item):
     
     @property
@@ -19,7 +74,7 @@ class Item(modo.Item):
         str
         """
         typeCode = self.internalItem.Type()
-        itemTypeName = lx.service.Scene().ItemTypeName(typeCode)
+        itemTypeName = _sceneService.ItemTypeName(typeCode)
         return itemTypeName
     
     def autoFocusInItemList(self):
@@ -40,14 +95,13 @@ class Item(modo.Item):
         ----------
         hierarchyRootItem : modo.Item
         """
+        targetIdent = hierarchyRootItem.id
         item = self.parent
-        result = False
         while item is not None:
-            if item == hierarchyRootItem:
-                result = True
-                break
+            if item.id == targetIdent:
+                return True
             item = item.parent
-        return result
+        return False
     
     @property
     def rootSuperType(self):
@@ -58,20 +112,7 @@ class Item(modo.Item):
         str
             Super type as string or None if item has no supertype (is super type itself).
         """
-        sceneService = lx.service.Scene()
-        superType = self.internalItem.Type()
-        rootSuperType = None
-    
-        while superType != 0:
-            superType = sceneService.ItemTypeSuper(superType)
-            if superType == 0:
-                break
-            rootSuperType = superType
-    
-        if rootSuperType:
-            return sceneService.ItemTypeName(rootSuperType)
-
-        return None
+        return _rootSuperTypeForCode(self.internalItem.Type())
 
     @property
     def isOfXfrmCoreSuperType(self):
@@ -109,17 +150,19 @@ class Item(modo.Item):
         if includeRoot:
             hierarchy.append(self)
             
-        queue = self.children(recursive=False)
-    
-        while queue and len(queue) > 0:
-            # The 0 index for pop() is crucial to get hierarchy that is in right order!
-            # Or at least in the order in which it appears in item list.
-            i = queue.pop(0)
-            hierarchy.append(i)
-            subItems = i.children(recursive=False)
-            if subItems and len(subItems) > 0:
-                queue += subItems
-        
+        # The hierarchy is expanded one level at a time. Each frontier is
+        # appended whole which keeps items grouped by depth (and siblings
+        # in item list order) without per element queue operations.
+        current = self.children(recursive=False) or []
+        while current:
+            hierarchy.extend(current)
+            nextLevel = []
+            for i in current:
+                subItems = i.children(recursive=False)
+                if subItems:
+                    nextLevel.extend(subItems)
+            current = nextLevel
+
         return hierarchy
 
     def addUserChannel(self, name, storageType, username=None):
@@ -153,12 +196,12 @@ class Item(modo.Item):
         # Right now creating user channels has to be done via lx.eval
         if username:
             try:
-                lx.eval('!channel.create "%s" %s item:{%s} username:{%s}' % (name, storageType, self.id, username))
+                lx.eval(_CMD_CHAN_CREATE_USERNAME % (name, storageType, self.id, username))
             except RuntimeError:
                 return None
         else:
             try:
-                lx.eval('!channel.create "%s" %s item:{%s}' % (name, storageType, self.id))
+                lx.eval(_CMD_CHAN_CREATE % (name, storageType, self.id))
             except RuntimeError:
                 return None
         return self.channel(name)
@@ -172,17 +215,20 @@ class Item(modo.Item):
             When set the list will be returned in order in which channels
             are listed on the item. It will be reverse order otherwise.
         """
-        chanCount = self.internalItem.ChannelCount()
+        internalItem = self.internalItem
+        chanCount = internalItem.ChannelCount()
         chanList = []
         # Channels are scanned in reverse order.
         # The list will have to be reversed at the end.
         # Searching stops at the first channel that belongs
         # to some package. User channels have no package.
-        for i in xrange(chanCount - 1, -1, -1):
+        channelPackage = internalItem.ChannelPackage
+        channelName = internalItem.ChannelName
+        for i in range(chanCount - 1, -1, -1):
             try:
-                package = self.internalItem.ChannelPackage(i)
+                channelPackage(i)
             except LookupError:
-                chanList.append(self.internalItem.ChannelName(i))
+                chanList.append(channelName(i))
                 continue
             else:
                 break
@@ -204,18 +250,29 @@ class Item(modo.Item):
         -------
         list of modo.Channel
         """
+        internalItem = self.internalItem
         channels = []
-        channelNames = self.getUserChannelsNames(sort)
-        for chanName in channelNames:
-            chanObj = self.channel(chanName)
-            if chanObj is not None and chanObj:
-                channels.append(chanObj)
+        # Single reverse scan over the channel list, constructing channels
+        # from indices directly. This skips the intermediate name list and
+        # the by-name lookup for each channel.
+        channelPackage = internalItem.ChannelPackage
+        for i in range(internalItem.ChannelCount() - 1, -1, -1):
+            try:
+                channelPackage(i)
+            except LookupError:
+                channels.append(modo.Channel(i, self))
+                continue
+            else:
+                break
+        if sort:
+            channels.reverse()
         return channels
     
     def hasUserChannels(self):
-        chanCount = self.internalItem.ChannelCount()
+        internalItem = self.internalItem
+        chanCount = internalItem.ChannelCount()
         try:
-            package = self.internalItem.ChannelPackage(chanCount - 1)
+            internalItem.ChannelPackage(chanCount - 1)
         except LookupError:
             return True
         return False
@@ -234,7 +291,7 @@ class Item(modo.Item):
             Item command string the way it should be put into Assembly properties.
         """
         try:
-            lx.eval('!item.command add {%s} item:{%s}' % (cmdString, self.id))
+            lx.eval(_CMD_ITEM_COMMAND % (cmdString, self.id))
         except RuntimeError:
             pass
 
@@ -273,9 +330,9 @@ class ItemUtils(object):
                 continue
             modoItem.setParent(parentItem, -1)
             pos = modo.LocatorSuperType(modoItem).position
-            pos.x.set(offset.x, 0.0, False, lx.symbol.s_ACTIONLAYER_SETUP)
-            pos.y.set(offset.y, 0.0, False, lx.symbol.s_ACTIONLAYER_SETUP)
-            pos.z.set(offset.z, 0.0, False, lx.symbol.s_ACTIONLAYER_SETUP)
+            pos.x.set(offset.x, 0.0, False, _ACTIONLAYER_SETUP)
+            pos.y.set(offset.y, 0.0, False, _ACTIONLAYER_SETUP)
+            pos.z.set(offset.z, 0.0, False, _ACTIONLAYER_SETUP)
             break
 
     @classmethod
@@ -290,7 +347,7 @@ class ItemUtils(object):
         targetItems : modo.Item, list of modo.Item
             Items to which the modoItem will be connected to with a forward graph link.
         """
-        if type(targetItems) not in (list, tuple):
+        if not isinstance(targetItems, (list, tuple)):
             targetItems = [targetItems]
         
         plugGraph = modoItem.itemGraph(graphName)
@@ -327,7 +384,7 @@ class ItemUtils(object):
         return None
 
     @classmethod
-    def clearForwardGraphConnections(self, modoItem, graphName, specificItems=[]):
+    def clearForwardGraphConnections(self, modoItem, graphName, specificItems=None):
         """ Clears all forward connections from an item on a given graph.
         
         Paramters
@@ -342,12 +399,14 @@ class ItemUtils(object):
         if not existingConnections:
             return
 
+        specificIds = None
         if specificItems:
-            if type(specificItems) not in (list, tuple):
+            if not isinstance(specificItems, (list, tuple)):
                 specificItems = [specificItems]
+            specificIds = set(item.id for item in specificItems)
 
         for connection in existingConnections:
-            if specificItems and connection not in specificItems:
+            if specificIds is not None and connection.id not in specificIds:
                 continue
 
             fwdGraph = connection.itemGraph(graphName)
@@ -382,7 +441,7 @@ class ItemUtils(object):
         targetItems : modo.Item, list of modo.Item
             Items to which the modoItem will be connected to with a reverse graph link.
         """
-        if type(targetItems) not in (list, tuple):
+        if not isinstance(targetItems, (list, tuple)):
             targetItems = [targetItems]
         
         plugGraph = modoItem.itemGraph(graphName)
@@ -419,7 +478,7 @@ class ItemUtils(object):
         return None
         
     @classmethod
-    def clearReverseGraphConnections(self, modoItem, graphName, specificItems=[]):
+    def clearReverseGraphConnections(self, modoItem, graphName, specificItems=None):
         """ Clears all reverse connections from an item on a given graph.
         
         Paramters
@@ -434,12 +493,14 @@ class ItemUtils(object):
         if not existingConnections:
             return
 
+        specificIds = None
         if specificItems:
-            if type(specificItems) not in (list, tuple):
+            if not isinstance(specificItems, (list, tuple)):
                 specificItems = [specificItems]
+            specificIds = set(item.id for item in specificItems)
 
         for connection in existingConnections:
-            if specificItems and connection not in specificItems:
+            if specificIds is not None and connection.id not in specificIds:
                 continue
 
             revGraph = connection.itemGraph(graphName)
@@ -459,26 +520,105 @@ class ItemUtils(object):
         tree = []
         if includeRoot:
             tree = [modoItem]
-        cls._traverseTree(modoItem, tree)
+
+        # Iterative depth-first walk. Children are pushed in reverse so
+        # popping from the stack end visits them in item list order without
+        # paying a Python call frame per node or recursion depth limits.
+        stack = modoItem.children()
+        stack.reverse()
+        append = tree.append
+        pop = stack.pop
+        while stack:
+            node = pop()
+            append(node)
+            children = node.children()
+            if children:
+                children.reverse()
+                stack.extend(children)
         return tree
     
+    @classmethod
+    def getHierarchyRecursiveRaw(cls, modoItem, includeRoot=False):
+        """ Gets hierarchy in item list order using raw SDK only.
+
+        Same traversal as getHierarchyRecursive but operating on raw
+        items via SubCount()/SubByIndex(). Skipping the python wrapper
+        layer makes this the variant to use on scene scale hierarchies;
+        wrap results in modo.Item only where needed.
+
+        Parameters
+        ----------
+        modoItem : modo.Item
+
+        includeRoot : bool
+
+        Returns
+        -------
+        list of lx.object.Item
+        """
+        rawRoot = modoItem.internalItem
+        tree = []
+        if includeRoot:
+            tree = [rawRoot]
+
+        stack = [rawRoot.SubByIndex(x) for x in range(rawRoot.SubCount() - 1, -1, -1)]
+        append = tree.append
+        pop = stack.pop
+        while stack:
+            node = pop()
+            append(node)
+            for x in range(node.SubCount() - 1, -1, -1):
+                stack.append(node.SubByIndex(x))
+        return tree
+
+    # Item depths memoized by item ident so mass queries don't rewalk
+    # shared parent chains. See getHierarchyLevel.
+    _hierarchyDepthCache = {}
+
+    @classmethod
+    def invalidateHierarchyCache(cls):
+        """ Clears memoized hierarchy depths.
+
+        Call this after reparenting items so getHierarchyLevel does not
+        serve stale depths.
+        """
+        cls._hierarchyDepthCache.clear()
+
     @classmethod
     def getHierarchyLevel(cls, modoItem):
         """ Gets how deep given item is in hierarchy.
-        
+
+        Depths are cached by item ident so querying every item in a scene
+        walks each parent chain only once. Call invalidateHierarchyCache()
+        after changing parenting.
+
         Parameters
         ----------
         modoItem : modo.item
-        
+
         Returns
         -------
         int
         """
-        level = 0
-        item = modoItem.parent
+        cache = cls._hierarchyDepthCache
+        chain = []
+        item = modoItem
+        # Walk up until a cached ancestor (or the root) is met,
+        # then fill depths back down the collected chain.
+        baseLevel = -1
         while item is not None:
-            level += 1
+            try:
+                baseLevel = cache[item.id]
+                break
+            except KeyError:
+                pass
+            chain.append(item)
             item = item.parent
+
+        level = baseLevel
+        for chainItem in reversed(chain):
+            level += 1
+            cache[chainItem.id] = level
         return level
 
     @classmethod
@@ -508,31 +648,27 @@ class ItemUtils(object):
         This is the modifier that combines all 3 world transforms of an item.
         Usually used in dynamic parenting setup.
         """
-        wpos = modoItem.channel('wposMatrix')
-        wrot = modoItem.channel('wrotMatrix')
-        wscl = modoItem.channel('wsclMatrix')
-        
+        # Checks are ordered so the rotation and scale channels are only
+        # queried once the position link already points at a matrix compose.
         try:
-            chan = wpos.forward(0)
-            item1 = chan.item
+            item1 = modoItem.channel('wposMatrix').forward(0).item
         except LookupError:
             return None
+        if item1.type != 'cmMatrixCompose':
+            return None
+
         try:
-            chan = wrot.forward(0)
-            item2 = chan.item
+            if modoItem.channel('wrotMatrix').forward(0).item != item1:
+                return None
         except LookupError:
             return None
         try:
-            chan = wscl.forward(0)
-            item3 = chan.item
+            if modoItem.channel('wsclMatrix').forward(0).item != item1:
+                return None
         except LookupError:
             return None
-        
-        if (item1.type == 'cmMatrixCompose' and 
-            item1 == item2 and
-            item1 == item3):
-            return item1
-        return None
+
+        return item1
         
     @classmethod
     def getItemSelectionSets(self, modoItems):
@@ -543,9 +679,10 @@ class ItemUtils(object):
         list of str
             Empty list will be returned if the item is not assigned to any item selection sets.
         """
-        if type(modoItems) not in (list, tuple):
+        if not isinstance(modoItems, (list, tuple)):
             modoItems = [modoItems]
         
+        seen = set()
         allSets = []
         for modoItem in modoItems:
             try:
@@ -554,7 +691,10 @@ class ItemUtils(object):
                 continue
             itemSets = v.split(';')
             for iset in itemSets:
-                if iset not in allSets:
+                # The set gives O(1) membership, the list keeps the
+                # order in which selection sets were encountered.
+                if iset not in seen:
+                    seen.add(iset)
                     allSets.append(iset)
         return allSets
 
@@ -598,22 +738,22 @@ class ItemUtils(object):
         """
         newItems = []
         scene = modo.Scene()
-        
+
         for item in itemList:
             newItem = scene.addItem(itemType, item.name + '_duplicate')
             newItems.append(newItem)
-    
-        # Parenting
-        if len(newItems) > 1:
-            for x in xrange(1, len(newItems)):
-                newItems[x].setParent(newItems[x - 1])
-    
-        # Transform matching
-        for x in xrange(len(newItems)):
-            lx.eval('!item.match item pos average:false item:{%s} itemTo:{%s}' % (newItems[x].id, itemList[x].id))
-            lx.eval('!item.match item rot average:false item:{%s} itemTo:{%s}' % (newItems[x].id, itemList[x].id))
-            lx.eval('!item.match item scl average:false item:{%s} itemTo:{%s}' % (newItems[x].id, itemList[x].id))
-        
+
+        # Parenting and transform matching in one pass over the new chain.
+        previousItem = None
+        for newItem, sourceItem in zip(newItems, itemList):
+            if previousItem is not None:
+                newItem.setParent(previousItem)
+            ids = (newItem.id, sourceItem.id)
+            lx.eval(_CMD_MATCH_POS % ids)
+            lx.eval(_CMD_MATCH_ROT % ids)
+            lx.eval(_CMD_MATCH_SCL % ids)
+            previousItem = newItem
+
         return newItems
     
     @classmethod
@@ -677,8 +817,8 @@ class ItemUtils(object):
         if not internalItem.PackageTest('execCommand'):
             internalItem.PackageAdd('execCommand')
 
-        modoItem.channel('ecCmdString').set(commandString, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP)
-        modoItem.channel('ecEnable').set(True, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP)
+        modoItem.channel('ecCmdString').set(commandString, time=0.0, key=False, action=_ACTIONLAYER_SETUP)
+        modoItem.channel('ecEnable').set(True, time=0.0, key=False, action=_ACTIONLAYER_SETUP)
         if denyDropAction:
             modoItem.setTag('NDRG', 'denied')
 
@@ -712,14 +852,4 @@ class ItemUtils(object):
         internalItem = modoItem.internalItem
         if not internalItem.PackageTest('execCommand'):
             return None
-        return modoItem.channel('ecCmdString').get(time=0.0, action=lx.symbol.s_ACTIONLAYER_SETUP)
-
-    # -------- Private functions
-    
-    @classmethod
-    def _traverseTree(cls, modoItem, tree):
-        children = modoItem.children()
-        if children:
-            for child in children:
-                tree.append(child)
-                cls._traverseTree(child, tree)
\ No newline at end of file
+        return modoItem.channel('ecCmdString').get(time=0.0, action=_ACTIONLAYER_SETUP)
\ No newline at end of file
@@ -1,10 +1,100 @@
 
 
+import math
+import weakref
+
 import lx
 import modo
 import const as c
 
 
+# Raw identity matrix values for allocation free identity tests.
+_IDENTITY_M4_VALUES = ((1.0, 0.0, 0.0, 0.0),
+                       (0.0, 1.0, 0.0, 0.0),
+                       (0.0, 0.0, 1.0, 0.0),
+                       (0.0, 0.0, 0.0, 1.0))
+
+# Shared unit scale vector so scale tests don't allocate one per call.
+_UNIT_SCALE_V3 = modo.Vector3(1.0, 1.0, 1.0)
+
+# Command strings built once at import, not per call.
+_CMD_FREEZE_POSITION = '!transform.freeze translation'
+_CMD_FREEZE_ROTATION = '!transform.freeze rotation'
+_CMD_FREEZE_SCALE = '!transform.freeze scale'
+_CMD_PARENT_IN_PLACE = '!item.parent {%s} {%s} %d inPlace:1 duplicate:0'
+
+# Channel handles cached per item wrapper. The built in matrix channels
+# queried here exist for the entire life of a locator so entries never go
+# stale; the weak keying drops them together with the item wrapper.
+_itemChannelCache = weakref.WeakKeyDictionary()
+
+
+def _getChannel(modoItem, channelName):
+    """ Gets a channel from an item, caching handles per item wrapper.
+
+    Repeated queries on the same wrapper skip the string based channel
+    lookup inside the SDK.
+
+    Returns
+    -------
+    modo.Channel
+    """
+    channels = _itemChannelCache.get(modoItem)
+    if channels is None:
+        channels = {}
+        _itemChannelCache[modoItem] = channels
+    try:
+        return channels[channelName]
+    except KeyError:
+        chan = modoItem.channel(channelName)
+        channels[channelName] = chan
+        return chan
+
+
+# Locator super type wrappers reused between transform get/set calls,
+# keyed by item ident. Entries are held strongly - weak values would be
+# collected the moment the calling statement ends since the cache holds
+# the only reference. Idents get reused after delete/recreate and across
+# scene loads so hits are validated against the caller's raw item before
+# they are trusted; LocatorUtils.clearLocatorCache() still allows
+# dropping everything at once.
+_locatorWrappers = {}
+
+
+def _getLocator(modoItem):
+    """ Gets the LocatorSuperType wrapper for an item, reusing cached ones.
+
+    Returns
+    -------
+    modo.LocatorSuperType
+    """
+    ident = modoItem.id
+    rawItem = modoItem.internalItem
+    loc = _locatorWrappers.get(ident)
+    # A hit whose wrapper no longer matches the live raw item means the
+    # ident was reused; rebuild so writes cannot land on a dead item.
+    if loc is not None and loc.internalItem == rawItem:
+        return loc
+    loc = modo.LocatorSuperType(rawItem)
+    _locatorWrappers[ident] = loc
+    return loc
+
+
+def _setupActionOverride(action, time, key):
+    """ Normalizes time and key for channel writes on a given action.
+
+    Writes on the setup action always happen at time 0.0 and without keys.
+
+    Returns
+    -------
+    float, bool
+        Time and key values to use for the write.
+    """
+    if action == lx.symbol.s_ACTIONLAYER_SETUP:
+        return 0.0, False
+    return time, key
+
+
 class TransformItemType(object):
     POSITION = 'translation'
     ROTATION = 'rotation'
@@ -17,6 +107,19 @@ class LocatorUtils(object):
 
     TransformType = TransformItemType
 
+    # Value of the transform item 'type' channel on zero transform items.
+    # The channel has hints so TD SDK reads it back as a string.
+    _ZERO_XFRM_TYPE_HINT = '21'
+
+    @classmethod
+    def clearLocatorCache(cls):
+        """ Clears locator wrappers cached by the transform accessors.
+
+        The cache is keyed by item ident and idents can get reused,
+        call this after deleting items or switching scenes.
+        """
+        _locatorWrappers.clear()
+
     def hasAnyZeroTransforms(self, modoItem):
         """ Tests whether given item has any zero transforms in the stack.
 
@@ -28,8 +131,16 @@ class LocatorUtils(object):
         -------
         bool
         """
-        return (self._testForZeroTransformsOfType(modoItem, self.TransformType.POSITION) or
-                self._testForZeroTransformsOfType(modoItem, self.TransformType.ROTATION))
+        # Both transform types are tested against a single stack fetch,
+        # going through _testForZeroTransformsOfType would refetch the
+        # stack for each type.
+        loc = modo.LocatorSuperType(modoItem)
+        transforms = list(loc.transforms)
+        if len(transforms) < 2:
+            return False
+
+        return (self._getZeroTransformFromTheStack(transforms, loc.position) is not None or
+                self._getZeroTransformFromTheStack(transforms, loc.rotation) is not None)
 
     def mergeAllZeroTransforms(self, modoItem, removeZeroXfrmItems=True):
         """ Merges position and rotation zero transforms with their primary transforms.
@@ -54,6 +165,42 @@ class LocatorUtils(object):
         self.mergePositionZeroTransform(modoItem, removeZeroXfrmItems)
         self.mergeRotationZeroTransform(modoItem, removeZeroXfrmItems)
 
+    def mergeAllZeroTransformsBatch(self, modoItems, removeZeroXfrmItems=True):
+        """ Merges zero transforms for a batch of items.
+
+        For rig wide cleanup this is cheaper then calling
+        mergeAllZeroTransforms per item: each item's transform stack is
+        fetched and scanned once for both transform types and the merge
+        command string is built once for the whole batch.
+
+        Parameters
+        ----------
+        modoItems : list of modo.Item
+            Items to perform merge on.
+
+        removeZeroXfrmItems : bool, optional
+            When set to true the cleared out zero transform items will be
+            removed from scene.
+        """
+        cmd = '!transform.merge rem:%d' % int(removeZeroXfrmItems)
+
+        pairs = []
+        for modoItem in modoItems:
+            loc = modo.LocatorSuperType(modoItem)
+            transforms = list(loc.transforms)
+            if len(transforms) < 2:
+                continue
+            for mainXfrmItem in (loc.position, loc.rotation):
+                zeroXfrmItem = self._getZeroTransformFromTheStack(transforms, mainXfrmItem)
+                if zeroXfrmItem is not None:
+                    pairs.append((zeroXfrmItem, mainXfrmItem))
+
+        # transform.merge works off the selected transform item pair so
+        # the command still has to fire once per pair.
+        for zeroXfrmItem, mainXfrmItem in pairs:
+            self._scene.select([zeroXfrmItem, mainXfrmItem])
+            lx.eval(cmd)
+
     def mergePositionZeroTransform(self, modoItem, removeZeroXfrmItem=True):
         self._mergeTransformsOfType(modoItem, self.TransformType.POSITION, removeZeroXfrmItem)
 
@@ -73,8 +220,8 @@ class LocatorUtils(object):
         -------
         tuple
         """
-        mtx = self.getItemWorldTransform(locItem)
-        return mtx.position
+        m = self._rawMatrix4(locItem, 'worldMatrix')
+        return (m[3][0], m[3][1], m[3][2])
 
     @classmethod
     def getItemWorldPositionVector(self, locItem):
@@ -92,6 +239,46 @@ class LocatorUtils(object):
         v = self.getItemWorldPosition(locItem)
         return modo.Vector3(v[0], v[1], v[2])
 
+    @classmethod
+    def getItemWorldDecomposed(cls, modoItem, transpose=True):
+        """ Gets item world position, rotation and scale in one matrix read.
+
+        Use this when more then one component is needed. The world matrix
+        channel is evaluated once here where the separate accessors would
+        evaluate a channel per component.
+
+        Parameters
+        ----------
+        modoItem : modo.Item
+            The item to decompose world transform of.
+
+        transpose : bool
+            Same meaning as in getItemWorldRotation().
+
+        Returns
+        -------
+        tuple, modo.Matrix3, modo.Vector3
+            Position, rotation and scale in world space.
+        """
+        m = cls._rawMatrix4(modoItem, 'worldMatrix')
+        position = (m[3][0], m[3][1], m[3][2])
+        scale = cls._rawScaleVector(m)
+
+        # Rotation rows are the upper 3x3 of the world matrix with scale
+        # divided out. These rows are already in the 4x4 matrix layout
+        # so the legacy 3x3 layout needs a transpose, not the other way round.
+        rows = []
+        for row, s in ((m[0], scale.x), (m[1], scale.y), (m[2], scale.z)):
+            if s:
+                rows.append((row[0] / s, row[1] / s, row[2] / s))
+            else:
+                rows.append((row[0], row[1], row[2]))
+        rotation = modo.Matrix3(rows[0], rows[1], rows[2])
+        if not transpose:
+            rotation.transpose()
+
+        return position, rotation, scale
+
     @classmethod
     def hasWorldTransform(self, modoItem):
         """ Tests whether an item has world transforms applied.
@@ -100,8 +287,10 @@ class LocatorUtils(object):
         -------
         bool
         """
-        wmtx = self.getItemWorldTransform(modoItem)
-        return wmtx != modo.Matrix4()
+        # Comparing raw matrix values skips allocating both the Matrix4
+        # wrapper for the channel value and a fresh identity to test against.
+        mtxObject = _getChannel(modoItem, 'worldMatrix').get()
+        return lx.object.Matrix(mtxObject).Get4() != _IDENTITY_M4_VALUES
 
     @classmethod
     def hasLocalScale(cls, modoItem):
@@ -110,7 +299,7 @@ class LocatorUtils(object):
         """
         mtx = cls.getItemLocalTransform(modoItem)
         scale = mtx.scale()
-        return scale != modo.Vector3(1.0, 1.0, 1.0)
+        return scale != _UNIT_SCALE_V3
 
     @classmethod
     def getItemWorldTransform(self, modoItem):
@@ -125,7 +314,7 @@ class LocatorUtils(object):
         -------
         modo.Matrix4
         """
-        mtxObject = modoItem.channel('worldMatrix').get() # this gets lx.unknown
+        mtxObject = _getChannel(modoItem, 'worldMatrix').get() # this gets lx.unknown
         return modo.Matrix4(mtxObject)
 
     @classmethod
@@ -138,7 +327,7 @@ class LocatorUtils(object):
         modo.Channel, None
             None is returned when channel cannot be found.
         """
-        return modoItem.channel('wposMatrix')
+        return _getChannel(modoItem, 'wposMatrix')
 
     @classmethod
     def getItemWorldRotation(self, modoItem, transpose=True):
@@ -162,15 +351,16 @@ class LocatorUtils(object):
         -------
         modo.Matrix3
         """
-        mtxObject = modoItem.channel('wrotMatrix').get() # this gets lx.unknown
-        worldMtx3 = modo.Matrix3(mtxObject)
+        mtxObject = _getChannel(modoItem, 'wrotMatrix').get() # this gets lx.unknown
         # The matrix HAS TO BE TRANSPOSED to be the correct modo.Matrix3.
         # This is some legacy issue in MODO itself where rotation matrices have
         # different order then transform ones.
         # This is also true when getting the world transform matrix.
+        # Transposing is done while building the matrix, directly from raw
+        # values, rather then constructing one and transposing it after.
         if transpose:
-            worldMtx3.transpose()
-        return worldMtx3
+            return self._transposedMatrix3(mtxObject)
+        return modo.Matrix3(mtxObject)
 
     @classmethod
     def getItemWorldRotationMatrixChannel(cls, modoItem):
@@ -182,7 +372,7 @@ class LocatorUtils(object):
         modo.Channel, None
             None is returned when channel cannot be found.
         """
-        return modoItem.channel('wrotMatrix')
+        return _getChannel(modoItem, 'wrotMatrix')
 
     @classmethod
     def getItemWorldScaleMatrixChannel(cls, modoItem):
@@ -194,7 +384,7 @@ class LocatorUtils(object):
         modo.Channel, None
             None is returned when channel cannot be found.
         """
-        return modoItem.channel('wsclMatrix')
+        return _getChannel(modoItem, 'wsclMatrix')
 
     @classmethod
     def getItemWorldScaleVector(cls, modoItem):
@@ -210,8 +400,7 @@ class LocatorUtils(object):
         -------
         modo.Vector3
         """
-        mtxObject = modoItem.channel('wsclMatrix').get() # this gets lx.unknown
-        return modo.Matrix4(mtxObject).scale()
+        return cls._rawScaleVector(cls._rawMatrix4(modoItem, 'wsclMatrix'))
 
     @classmethod
     def getItemLocalTransform(self, modoItem):
@@ -226,7 +415,7 @@ class LocatorUtils(object):
         -------
         modo.Matrix4
         """
-        mtxObject = modoItem.channel('localMatrix').get() # this gets lx.unknown
+        mtxObject = _getChannel(modoItem, 'localMatrix').get() # this gets lx.unknown
         return modo.Matrix4(mtxObject)
 
     @classmethod
@@ -241,8 +430,7 @@ class LocatorUtils(object):
         """
         if action == lx.symbol.s_ACTIONLAYER_SETUP:
             time = 0.0
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        return modo.Vector3(loc.position.get(time, action))
+        return modo.Vector3(_getLocator(modoItem).position.get(time, action))
 
     @classmethod
     def setItemPosition(self, modoItem, newPos, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP):
@@ -254,14 +442,12 @@ class LocatorUtils(object):
         
         Parameters
         ----------
-        newPos : modo.Vector3
+        newPos : modo.Vector3, tuple
         """
-        if action == lx.symbol.s_ACTIONLAYER_SETUP:
-            key = False
-            time = 0.0
-    
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        loc.position.set((newPos.x, newPos.y, newPos.z), time=time, key=key, action=action)
+        time, key = _setupActionOverride(action, time, key)
+        if not isinstance(newPos, (tuple, list)):
+            newPos = (newPos.x, newPos.y, newPos.z)
+        _getLocator(modoItem).position.set(newPos, time=time, key=key, action=action)
     
     @classmethod
     def setZeroPosition(self, modoItem, pos, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP):
@@ -296,8 +482,7 @@ class LocatorUtils(object):
         if action==lx.symbol.s_ACTIONLAYER_SETUP:
             time = 0.0
 
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        return modo.Vector3(loc.rotation.get(time, action))
+        return modo.Vector3(_getLocator(modoItem).rotation.get(time, action))
     
     @classmethod
     def setItemRotation(self, modoItem, newRot, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP):
@@ -308,15 +493,13 @@ class LocatorUtils(object):
         
         Parameters
         ----------
-        newRot : modo.Vector3
+        newRot : modo.Vector3, tuple
             Euler angles in radians.
         """
-        if action == lx.symbol.s_ACTIONLAYER_SETUP:
-            key = False
-            time = 0.0
-    
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        loc.rotation.set((newRot.x, newRot.y, newRot.z), time=time, key=key, action=action)
+        time, key = _setupActionOverride(action, time, key)
+        if not isinstance(newRot, (tuple, list)):
+            newRot = (newRot.x, newRot.y, newRot.z)
+        _getLocator(modoItem).rotation.set(newRot, time=time, key=key, action=action)
 
     @classmethod
     def getItemScale(self, modoItem, time=0.0, action=lx.symbol.s_ACTIONLAYER_EDIT):
@@ -332,8 +515,7 @@ class LocatorUtils(object):
         if action == lx.symbol.s_ACTIONLAYER_SETUP:
             time = 0.0
 
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        return modo.Vector3(loc.scale.get(time, action))
+        return modo.Vector3(_getLocator(modoItem).scale.get(time, action))
 
     @classmethod
     def setItemScale(self, modoItem, newScale, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP):
@@ -344,15 +526,13 @@ class LocatorUtils(object):
 
         Parameters
         ----------
-        newScale : modo.Vector3
+        newScale : modo.Vector3, tuple
             Scale as a vector.
         """
-        if action == lx.symbol.s_ACTIONLAYER_SETUP:
-            key = False
-            time = 0.0
-
-        loc = modo.LocatorSuperType(modoItem.internalItem)
-        loc.scale.set((newScale.x, newScale.y, newScale.z), time=time, key=key, action=action)
+        time, key = _setupActionOverride(action, time, key)
+        if not isinstance(newScale, (tuple, list)):
+            newScale = (newScale.x, newScale.y, newScale.z)
+        _getLocator(modoItem).scale.set(newScale, time=time, key=key, action=action)
 
     @classmethod
     def setZeroRotation(self, modoItem, rot, time=0.0, key=False, action=lx.symbol.s_ACTIONLAYER_SETUP):
@@ -418,7 +598,7 @@ class LocatorUtils(object):
         -------
         modo.Matrix4
         """
-        mtxObject = modoItem.channel('wParentMatrix').get() # this gets lx.unknown
+        mtxObject = _getChannel(modoItem, 'wParentMatrix').get() # this gets lx.unknown
         return modo.Matrix4(mtxObject)
 
     @classmethod
@@ -432,8 +612,7 @@ class LocatorUtils(object):
         -------
         modo.Vector3
         """
-        mtxObject = modoItem.channel('wParentMatrix').get() # this gets lx.unknown
-        return modo.Matrix4(mtxObject).scale()
+        return cls._rawScaleVector(cls._rawMatrix4(modoItem, 'wParentMatrix'))
 
     @classmethod
     def getItemParentWorldPosition(self, modoItem):
@@ -448,8 +627,8 @@ class LocatorUtils(object):
         -------
         tuple
         """
-        xfrm = self.getItemParentWorldTransform(modoItem)
-        return xfrm.position
+        m = self._rawMatrix4(modoItem, 'wParentMatrix')
+        return (m[3][0], m[3][1], m[3][2])
 
     @classmethod
     def getItemParentWorldOrientation(self, modoItem):
@@ -464,10 +643,8 @@ class LocatorUtils(object):
         -------
         modo.Matrix3
         """
-        mtxObject = modoItem.channel('wParentMatrix').get() # this gets lx.unknown
-        worldMtx3 = modo.Matrix3(mtxObject)
-        worldMtx3.transpose()
-        return worldMtx3
+        mtxObject = _getChannel(modoItem, 'wParentMatrix').get() # this gets lx.unknown
+        return self._transposedMatrix3(mtxObject)
 
     @classmethod
     def parentInPlace(self, modoItem, parentModoItem, index=-1):
@@ -480,7 +657,7 @@ class LocatorUtils(object):
         index : int
             Child index after parenting.
         """
-        lx.eval('!item.parent {%s} {%s} %d inPlace:1 duplicate:0' % (modoItem.id, parentModoItem.id, index))
+        lx.eval(_CMD_PARENT_IN_PLACE % (modoItem.id, parentModoItem.id, index))
 
     @classmethod
     def getTransformItem(cls, modoItem, transformType):
@@ -491,7 +668,7 @@ class LocatorUtils(object):
         -------
         modo.TransformItem
         """
-        loc = modo.LocatorSuperType(modoItem.internalItem)
+        loc = _getLocator(modoItem)
         if transformType == c.TransformType.POSITION:
             return loc.position
         elif transformType == c.TransformType.ROTATION:
@@ -505,30 +682,74 @@ class LocatorUtils(object):
     def freezeTransforms(cls, modoItem, position=False, rotation=False, scale=False):
         modoItem.select(replace=True)
         if position:
-            lx.eval('!transform.freeze translation')
+            lx.eval(_CMD_FREEZE_POSITION)
         if rotation:
-            lx.eval('!transform.freeze rotation')
+            lx.eval(_CMD_FREEZE_ROTATION)
         if scale:
-            lx.eval('!transform.freeze scale')
+            lx.eval(_CMD_FREEZE_SCALE)
 
     # -------- Private methods
 
+    @classmethod
+    def _rawMatrix4(cls, modoItem, channelName):
+        """
+        Reads a matrix channel as raw nested value tuples.
+
+        This skips building the modo.Matrix4 wrapper which matters when
+        only a component or two of the matrix is needed.
+
+        Returns
+        -------
+        tuple of tuple of float
+        """
+        return lx.object.Matrix(_getChannel(modoItem, channelName).get()).Get4()
+
+    @classmethod
+    def _transposedMatrix3(cls, mtxObject):
+        """
+        Builds a transposed modo.Matrix3 straight from a raw matrix object.
+
+        Rows are swapped with columns while reading the raw values so no
+        intermediate matrix is constructed and transposed after the fact.
+
+        Returns
+        -------
+        modo.Matrix3
+        """
+        m = lx.object.Matrix(mtxObject).Get3()
+        return modo.Matrix3((m[0][0], m[1][0], m[2][0]),
+                            (m[0][1], m[1][1], m[2][1]),
+                            (m[0][2], m[1][2], m[2][2]))
+
+    @classmethod
+    def _rawScaleVector(cls, m):
+        """
+        Gets the scale vector from raw 4x4 matrix values.
+
+        Scale components are the magnitudes of the first three rows,
+        same as modo.Matrix4.scale().
+
+        Returns
+        -------
+        modo.Vector3
+        """
+        return modo.Vector3(
+            math.sqrt(m[0][0] * m[0][0] + m[0][1] * m[0][1] + m[0][2] * m[0][2]),
+            math.sqrt(m[1][0] * m[1][0] + m[1][1] * m[1][1] + m[1][2] * m[1][2]),
+            math.sqrt(m[2][0] * m[2][0] + m[2][1] * m[2][1] + m[2][2] * m[2][2]))
+
     def _mergeTransformsOfType(self, modoItem, xfrmType, removeZeroXfrmItem=True):
         loc = modo.LocatorSuperType(modoItem)
-        if len(loc.transforms) < 2:
+        transforms = list(loc.transforms)
+        if len(transforms) < 2:
             return
-        
+
         if xfrmType == self.TransformType.POSITION:
             mainXfrmItem = loc.position
         elif xfrmType == self.TransformType.ROTATION:
             mainXfrmItem = loc.rotation
 
-        # Need to reverse transforms list to walk the stack
-        # from bottom up.
-        transformsStack = [xfrm for xfrm in loc.transforms]
-        transformsStack.reverse()
-
-        zeroXfrmItem = self._getZeroTransformFromTheStack(transformsStack, mainXfrmItem)
+        zeroXfrmItem = self._getZeroTransformFromTheStack(transforms, mainXfrmItem)
         if zeroXfrmItem is not None:
             self._scene.select([zeroXfrmItem, mainXfrmItem])
             lx.eval('!transform.merge rem:%d' % int(removeZeroXfrmItem))
@@ -544,7 +765,7 @@ class LocatorUtils(object):
             None is returned when no zero transform was found.
         """
         loc = modo.LocatorSuperType(modoItem)
-        transforms = loc.transforms
+        transforms = list(loc.transforms)
         if len(transforms) < 2:
             return None
         
@@ -553,11 +774,7 @@ class LocatorUtils(object):
         elif xfrmType == self.TransformType.ROTATION:
             mainXfrmItem = loc.rotation
 
-        # Need to reverse transforms list to walk the stack
-        # from bottom up.
-        transformsStack = [xfrm for xfrm in transforms]
-        transformsStack.reverse()
-        return self._getZeroTransformFromTheStack(transformsStack, mainXfrmItem)
+        return self._getZeroTransformFromTheStack(transforms, mainXfrmItem)
 
     def _testForZeroTransformsOfType(self, modoItem, xfrmType):
         """
@@ -566,11 +783,15 @@ class LocatorUtils(object):
         return self._getZeroTransformOfType(modoItem, xfrmType) is not None
 
     @classmethod
-    def _getZeroTransformFromTheStack(cls, transformsStack, mainXfrmItem):
+    def _getZeroTransformFromTheStack(cls, transforms, mainXfrmItem):
         """
-        Gets zero transform item given transform stack and the main transform item
+        Gets zero transform item given transforms list and the main transform item
         to start scanning from.
 
+        Transforms are expected in loc.transforms order. The zero transform sits
+        above the main one in the stack so the scan walks towards the start of
+        the list - no reversed copy is needed.
+
         This is using proper zero transform item identification that is not exposed
         in SDK but is used by MODO internally.
         Zero transform item 'type' integer channel has value of 21 on zero transform items.
@@ -580,34 +801,29 @@ class LocatorUtils(object):
         modo.Item, None
             None is returned if there's no zero transform item for an item.
         """
+        # Scanning by ident resolves the main item ident once; going
+        # through list.index would dispatch modo.Item __eq__ per element
+        # and re-read the main item ident inside each comparison.
+        mainIdent = mainXfrmItem.id
         scanIndex = -1
-        for x in xrange(len(transformsStack) - 1):
-            if transformsStack[x] == mainXfrmItem:
+        for x, xfrmItem in enumerate(transforms):
+            if xfrmItem.id == mainIdent:
                 scanIndex = x
                 break
 
         if scanIndex < 0:
             return None
 
-        offset = 1
-        zeroXfrmItem = None
-        while True:
-            try:
-                upXfrmItem = transformsStack[scanIndex + offset]
-            except IndexError:
-                break
-            if upXfrmItem.type != mainXfrmItem.type:
+        mainType = mainXfrmItem.type
+        for x in xrange(scanIndex - 1, -1, -1):
+            upXfrmItem = transforms[x]
+            if upXfrmItem.type != mainType:
                 break
 
-            # This channel has hints so TD SDK reading comes back as str
-            # This is why even if we're after int number we still test it as a string.
             valString = upXfrmItem.channel('type').get(None, lx.symbol.s_ACTIONLAYER_SETUP)
-            if valString == '21':
-                zeroXfrmItem = upXfrmItem
-                break
-
-            offset += 1
-        return zeroXfrmItem
+            if valString == cls._ZERO_XFRM_TYPE_HINT:
+                return upXfrmItem
+        return None
 
     def __init__(self, modoScene=None):
         if modoScene is None:
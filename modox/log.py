@@ -5,6 +5,18 @@ import os.path
 import lx
 
 
+# Log service is shared by all Log instances, constructed lazily on
+# first use so importing the module stays cheap.
+_logService = None
+
+
+def _getLogService():
+    global _logService
+    if _logService is None:
+        _logService = lx.service.Log()
+    return _logService
+
+
 class Log(object):
     """ Allows for printing messages to custom MODO log.
     
@@ -51,19 +63,18 @@ class Log(object):
         else:
             self._logSystem.AddEntry(entry)
 
-        if self._outputToFile and self._outputFilename:
-            m = self._inset + self.MSG_TYPE_PREFIX[messageType] + messageString + "\n"
-            f = open(self._outputFilename, mode='a')
-            f.write(m)
-            f.close()
+        if self._outputToFile and self._fileHandle is not None:
+            self._fileHandle.write(self._insetPrefixes[messageType] + messageString + "\n")
         
     def startChildEntries(self):
         self._parentEntry = self._lastEntry
         self._inset += self.LOG_INSET
+        self._refreshInsetPrefixes()
 
     def stopChildEntries(self):
         self._parentEntry = None
         self._inset = ''
+        self._refreshInsetPrefixes()
 
     def outputToFile(self, filename):
         """ Triggers outputting log messages to a file.
@@ -74,24 +85,57 @@ class Log(object):
             Pass filename to start outputting to a given file (it will be overwritten!)
             or None to stop outputting to a file.
         """
+        self.close()
+
         if filename is not None:
             self._outputFilename = filename
             self._outputToFile = True
+            # The handle is kept open between out() calls so each log line
+            # does not pay for an open/close cycle. close() or outputToFile(None)
+            # releases it.
+            self._fileHandle = open(filename, mode='w')
+            self._fileHandle.write('Debug Logging Started\n')
+            self._fileHandle.write('---------------------\n')
         else:
             self._outputFilename = ''
             self._outputToFile = False
-        
-        if self._outputToFile:
-            f = open(filename, mode='w')
-            f.write('Debug Logging Started\n')
-            f.write('---------------------\n')
-            f.close()
+
+    def flush(self):
+        """ Flushes buffered file output to disk.
+        """
+        if self._fileHandle is not None:
+            self._fileHandle.flush()
+
+    def close(self):
+        """ Closes the log output file (if any).
+        """
+        if self._fileHandle is not None:
+            self._fileHandle.close()
+            self._fileHandle = None
 
     # -------- Private Methods
+
+    def _refreshInsetPrefixes(self):
+        """ Rebuilds inset and message type prefix combinations.
+
+        The inset only changes in start/stopChildEntries so combining
+        it with the type prefixes there keeps out() down to a single
+        concatenation per line.
+        """
+        inset = self._inset
+        self._insetPrefixes = dict(
+            (msgType, inset + prefix)
+            for msgType, prefix in self.MSG_TYPE_PREFIX.items())
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def __init__(self, logSystemName, defaultSystemName='python'):
         self._logName = logSystemName
-        self._logService = lx.service.Log()
+        self._logService = _getLogService()
         try:
             self._logSystem = self._logService.SubSystemLookup(self._logName)
         except LookupError:
@@ -100,4 +144,6 @@ class Log(object):
         self._parentEntry = None
         self._outputToFile = False
         self._outputFilename = ''
-        self._inset = ''
\ No newline at end of file
+        self._fileHandle = None
+        self._inset = ''
+        self._refreshInsetPrefixes()
\ No newline at end of file
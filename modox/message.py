@@ -3,6 +3,18 @@
 import lx
 
 
+# Message service shared across all Message objects, constructed lazily
+# on first use.
+_msgService = None
+
+
+def _getMessageService():
+    global _msgService
+    if _msgService is None:
+        _msgService = lx.service.Message()
+    return _msgService
+
+
 class MessageCode(object):
     OK = lx.symbol.e_OK
     FALSE = lx.symbol.e_FALSE
@@ -31,8 +43,7 @@ class Message(object):
         -------
         str
         """
-        msgService = lx.service.Message()
-        msg = lx.object.Message(msgService.Allocate())
+        msg = lx.object.Message(_getMessageService().Allocate())
         xmsg = Message(msg)
         xmsg.set(table, key, arguments=arguments)
         return xmsg.text
@@ -65,27 +76,19 @@ class Message(object):
             raise LookupError
         
         if arguments:
-            if type(arguments) not in (tuple, list):
-                arguments = [arguments]
-                
-            argIndex = 1
-            for value in arguments:
-                if type(value) in (int, long):
-                    self._msg.SetArgumentInt(argIndex, value)
-                elif isinstance(value, float):
-                    self._msg.SetArgumentFloat(argIndex, value)
-                elif isinstance(value, str):
-                    self._msg.SetArgumentString(argIndex, value)
-                else:
-                    self._msg.SetArgumentObject(argIndex, value)
-                argIndex += 1
+            if not isinstance(arguments, (tuple, list)):
+                arguments = (arguments,)
+
+            argSetters = self._argSetters
+            setObject = self._msg.SetArgumentObject
+            for argIndex, value in enumerate(arguments, 1):
+                argSetters.get(type(value), setObject)(argIndex, value)
 
     @property
     def text(self):
         """ Gets message text. Works after message is set via set().
         """
-        msgService = lx.service.Message()
-        return msgService.MessageText(self._msg)
+        return _getMessageService().MessageText(self._msg)
 
     def setCode(self, code):
         """
@@ -102,4 +105,11 @@ class Message(object):
     # -------- Private methods
     
     def __init__(self, msg):
-        self._msg = lx.object.Message(msg)
\ No newline at end of file
+        self._msg = lx.object.Message(msg)
+        # Argument setters dispatched by exact value type, anything not
+        # in the table (bools included) goes through SetArgumentObject.
+        setInt = self._msg.SetArgumentInt
+        self._argSetters = {int: setInt,
+                            long: setInt,
+                            float: self._msg.SetArgumentFloat,
+                            str: self._msg.SetArgumentString}
\ No newline at end of file
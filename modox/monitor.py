@@ -3,6 +3,17 @@
 import lx
 
 
+# Dialog service shared across monitors, constructed lazily on first use.
+_dialogService = None
+
+
+def _getDialogService():
+    global _dialogService
+    if _dialogService is None:
+        _dialogService = lx.service.StdDialog()
+    return _dialogService
+
+
 class Monitor(object):
     """ Wrapper for using progress monitors.
     
@@ -31,13 +42,16 @@ class Monitor(object):
         if ticksCount < 1:
             ticksCount = 1
 
-        self._dialogService = lx.service.StdDialog()
+        self._dialogService = _getDialogService()
         self._monitor = lx.object.Monitor(self._dialogService.MonitorAllocate(title))
         self._monitor.Initialize(int(ticksCount))
 
         self._totalTicks = ticksCount
         self._intTicksProgress = 0
         self._floatTicksProgress = 0.0
+        self._pendingTicks = 0
+        # Buffered ticks are pushed to the monitor in roughly 1% steps.
+        self._flushThreshold = max(1, int(ticksCount / 100))
 
     @property
     def monitor(self):
@@ -59,15 +73,48 @@ class Monitor(object):
         ----------
         tickAmount : float
         """
+        # Integer ticks need no fractional reconciliation so they go
+        # straight to the monitor with a single increment.
+        if isinstance(tickAmount, (int, long)):
+            self._intTicksProgress += tickAmount
+            self._floatTicksProgress += tickAmount
+            self._monitor.Increment(tickAmount)
+            return
+
         self._floatTicksProgress += tickAmount
-        self._intTicksProgress += int(tickAmount)
-        
+        intTick = int(tickAmount)
+        self._intTicksProgress += intTick
+
         missingTicks = int(self._floatTicksProgress) - self._intTicksProgress
         if missingTicks > 0:
-            tickAmount += missingTicks
+            intTick += missingTicks
             self._intTicksProgress += missingTicks
 
-        self._monitor.Increment(int(tickAmount))
+        self._monitor.Increment(intTick)
+
+    def tickBuffered(self, tickAmount=1):
+        """ Increments monitor by tickAmount, buffering SDK calls.
+
+        Ticks accumulate on the python side and are pushed to the
+        monitor once about 1% of total progress is gathered. Use this
+        instead of tick() in tight loops that tick single elements;
+        call flush() (or release()) to push any remainder.
+
+        Parameters
+        ----------
+        tickAmount : int, float
+        """
+        self._pendingTicks += tickAmount
+        if self._pendingTicks >= self._flushThreshold:
+            self.flush()
+
+    def flush(self):
+        """ Pushes any buffered ticks to the monitor.
+        """
+        pending = self._pendingTicks
+        if pending > 0:
+            self._pendingTicks = 0
+            self.tick(pending)
 
     @property
     def progress(self):
@@ -84,6 +131,7 @@ class Monitor(object):
         ---------
         tickAmount : int
         """
+        self.flush()
         tickAmount = int(tickAmount)
         if tickAmount <= int(self._floatTicksProgress):
             return
@@ -96,12 +144,15 @@ class Monitor(object):
         
         This HAS to be called when the job is done!
         """
+        self.flush()
         self._dialogService.MonitorRelease()
 
     # -------- Private methods
 
     def __init__ (self, ticksCount=None, title=None):
         self._monitor = lx.object.Monitor()
+        self._pendingTicks = 0
+        self._flushThreshold = 1
         if ticksCount is not None and title is not None:
             self.setup(ticksCount, title)
 
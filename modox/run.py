@@ -3,6 +3,43 @@ import lx
 
 from log import Log
 
+# The python log used for reporting failed commands is constructed once
+# on first failure and shared between run() calls.
+_defaultLog = None
+
+
+def _getDefaultLog():
+    global _defaultLog
+    if _defaultLog is None:
+        _defaultLog = Log('python')
+    return _defaultLog
+
+
+def setDefaultLog(log):
+    """ Sets the log that run() reports failed commands through.
+
+    Host plugins that keep their own log can wire it in once instead of
+    passing it to every run() call.
+
+    Parameters
+    ----------
+    log : modox.Log, None
+        Pass None to go back to the standard 'python' log.
+    """
+    global _defaultLog
+    _defaultLog = log
+
+
+def getDefaultLog():
+    """ Gets the log that run() reports failed commands through.
+
+    Returns
+    -------
+    modox.Log
+    """
+    return _getDefaultLog()
+
+
 def run(cmdString, logErrors=True, log=None):
     """ Runs a command via lx.eval.
     
@@ -22,11 +59,41 @@ def run(cmdString, logErrors=True, log=None):
     try:
         return lx.eval(cmdString)
     except RuntimeError, e:
-        if logErrors:
-            if log is None:
-                log = Log('python')
-            log.out('Command Failed: %s' % cmdString, log.MSG_ERROR)
-            log.startChildEntries()
-            log.out(e.message, log.MSG_ERROR)
-            log.stopChildEntries()
-    return None
\ No newline at end of file
+        if not logErrors:
+            return None
+        if log is None:
+            log = _getDefaultLog()
+        log.out('Command Failed: %s' % cmdString, log.MSG_ERROR)
+        log.startChildEntries()
+        log.out(e.message, log.MSG_ERROR)
+        log.stopChildEntries()
+    return None
+
+
+def runMany(commands, logErrors=True, log=None):
+    """ Runs a sequence of commands via lx.eval.
+
+    The log used for error reporting is resolved once for the whole
+    batch rather then per failed command.
+
+    Parameters
+    ----------
+    commands : list of str
+        Command strings to run in order.
+
+    log : modox.Log, None
+        Log to output potential error messages through.
+        When None is passed a standard 'python' log is used.
+
+    Returns
+    -------
+    list
+        Return values from lx.eval, None for commands that failed.
+    """
+    if logErrors and log is None:
+        log = _getDefaultLog()
+    results = []
+    append = results.append
+    for cmdString in commands:
+        append(run(cmdString, logErrors=logErrors, log=log))
+    return results
\ No newline at end of file
@@ -5,26 +5,53 @@ import lxu
 import modo
 
 
+# Value service is a singleton on modo's side, one module level handle
+# saves an SDK trampoline per frame range query.
+_valueService = lx.service.Value()
+
+
 class SceneUtils(object):
-    
+
+    # Raw scene cached by beginBatch(), None when not batching.
+    _batchScene = None
+
+    @classmethod
+    def beginBatch(cls):
+        """ Caches the current scene for subsequent findItemFast() calls.
+
+        Use this around loops that look up many items by ident, it skips
+        the SceneSelection wrapper allocation per lookup. The cache is
+        only valid as long as the current scene does not change; call
+        endBatch() when done (or when switching scenes).
+        """
+        cls._batchScene = lxu.select.SceneSelection().current()
+
+    @classmethod
+    def endBatch(cls):
+        """ Releases the scene cached with beginBatch().
+        """
+        cls._batchScene = None
+
     @classmethod
     def findItemFast(cls, itemIdent):
         """ Finds an item in current scene using raw python API.
-        
+
         Parameters
         ----------
         itemIdent : str
-        
+
         Returns
         -------
         lxu.object.Item
-        
+
         Raises
         ------
         LookupError
             When item cannot be found.
         """
-        rawScene = lxu.select.SceneSelection().current()
+        rawScene = cls._batchScene
+        if rawScene is None:
+            rawScene = lxu.select.SceneSelection().current()
         try:
             return rawScene.ItemLookup(itemIdent)
         except LookupError:
@@ -53,9 +80,8 @@ class TimeUtils(object):
         startTime = lx.eval('time.range %s in:?' % rangeType)
         endTime = lx.eval('time.range %s out:?' % rangeType)
 
-        valueService = lx.service.Value()
-        startFrame = valueService.TimeToFrame(startTime)
-        endFrame = valueService.TimeToFrame(endTime)
+        startFrame = _valueService.TimeToFrame(startTime)
+        endFrame = _valueService.TimeToFrame(endTime)
 
         return int(startFrame), int(endFrame)
 
@@ -80,10 +106,9 @@ class TimeUtils(object):
         ValueError
             When none of the channels is animated and has any time range.
         """
-        startTime = 1000000.0
-        endTime = -1000000.0
-        animatedChannels = False
-        
+        firstTimes = []
+        lastTimes = []
+
         for channel in channels:
             # Get envelope in the read only format set to a given action.
             # Can't user TD SDK for that as the envelope is always set
@@ -92,25 +117,22 @@ class TimeUtils(object):
             if not chanRead.IsAnimated(channel.item, channel.index):
                 continue
             rawEnv = chanRead.Envelope(channel.item, channel.index)
-            env = modo.Envelope(rawEnv)
-
-            animatedChannels = True
-            keyframes = modo.Keyframes(env)
-            keyframes.first()
-            firstTime = keyframes.time
-            keyframes.last()
-            lastTime = keyframes.time
-            
-            if firstTime < startTime:
-                startTime = firstTime
-            
-            if lastTime > endTime:
-                endTime = lastTime
-        
-        if not animatedChannels:
+
+            # Go for the raw keyframe enumerator directly, wrapping the
+            # envelope in modo.Envelope/modo.Keyframes just to read two
+            # times costs two object constructions per channel.
+            keys = lx.object.Keyframe(rawEnv.Enumerator())
+            keys.First()
+            firstTimes.append(keys.GetTime())
+            keys.Last()
+            lastTimes.append(keys.GetTime())
+
+        if not firstTimes:
             raise ValueError
-        
-        return startTime, endTime
+
+        # Times are gathered first so the range comes out of two C level
+        # reductions rather then a pair of compares per channel.
+        return min(firstTimes), max(lastTimes)
 
     @classmethod
     def getChannelsFrameRange(cls, channels, action=lx.symbol.s_ACTIONLAYER_EDIT):
@@ -138,8 +160,7 @@ class TimeUtils(object):
         except ValueError:
             raise
         
-        valueService = lx.service.Value()
-        startFrame = valueService.TimeToFrame(startTime)
-        endFrame = valueService.TimeToFrame(endTime)
-        
+        startFrame = _valueService.TimeToFrame(startTime)
+        endFrame = _valueService.TimeToFrame(endTime)
+
         return startFrame, endFrame
@@ -4,6 +4,35 @@ import lx
 import lxu
 import modo
 from run import run
+from run import runMany
+
+
+# Services are singletons on modo's side, constructing them once at module
+# scope saves an SDK trampoline per selection object. Selection type codes
+# never change either so LookupType results are memoized as well.
+_selectionService = lx.service.Selection()
+_sceneService = lx.service.Scene()
+
+_selTypeCodes = {}
+
+
+def _lookupSelectionType(selTypeName):
+    code = _selTypeCodes.get(selTypeName)
+    if code is None:
+        code = _selectionService.LookupType(selTypeName)
+        _selTypeCodes[selTypeName] = code
+    return code
+
+
+_itemTypeCodes = {}
+
+
+def _lookupItemType(itemTypeName):
+    code = _itemTypeCodes.get(itemTypeName)
+    if code is None:
+        code = _sceneService.ItemTypeLookup(itemTypeName)
+        _itemTypeCodes[itemTypeName] = code
+    return code
 
 
 class SelectionMode(object):
@@ -25,12 +54,13 @@ class ItemSelection(object):
         -------
         list of lxu.object.Item
         """
-        a = []
-        for pkt in self._pkt_list():
-            item = lxu.object.Item(self._itemPacketTranslation.Item(pkt))
-            a.append(item)
+        RawItem = lxu.object.Item
+        pktItem = self._itemPacketTranslation.Item
+        code = self._itemSelTypeCode
+        byIndex = self._selectionService.ByIndex
+        count = self._selectionService.Count(code)
 
-        return a
+        return [RawItem(pktItem(byIndex(code, i))) for i in xrange(count)]
     
     def getLastRaw(self):
         """ Gets last item in the item selection.
@@ -78,14 +108,22 @@ class ItemSelection(object):
         if count == 0:
             return None
         
-        if isinstance(itemType, str):
-            itemType = self._sceneService.ItemTypeLookup(itemType)
-            
+        if type(itemType) is str:
+            itemType = _lookupItemType(itemType)
+
+        code = self._itemSelTypeCode
+        byIndex = self._selectionService.ByIndex
+        pktItem = self._itemPacketTranslation.Item
+
+        # A single probe wrapper is reused for the type test so rejected
+        # items do not pay for a fresh lxu wrapper allocation.
+        probe = lx.object.Item()
+
         for x in xrange(count - 1, -1, -1):
-            packet = self._selectionService.ByIndex(self._itemSelTypeCode, x)
-            rawItem = lxu.object.Item(self._itemPacketTranslation.Item(packet))
-            if rawItem.Type() == itemType:
-                return rawItem
+            handle = pktItem(byIndex(code, x))
+            probe.set(handle)
+            if probe.Type() == itemType:
+                return lxu.object.Item(handle)
         return None
     
     def getLastOfTypeModo(self, itemType):
@@ -125,15 +163,24 @@ class ItemSelection(object):
         if count == 0:
             return []
         
-        if isinstance(itemType, str):
-            itemType = self._sceneService.ItemTypeLookup(itemType)
-        
+        if type(itemType) is str:
+            itemType = _lookupItemType(itemType)
+
+        code = self._itemSelTypeCode
+        byIndex = self._selectionService.ByIndex
+        pktItem = self._itemPacketTranslation.Item
+        RawItem = lxu.object.Item
+
+        # A single probe wrapper is reused for the type test so rejected
+        # items do not pay for a fresh lxu wrapper allocation.
+        probe = lx.object.Item()
+
         rawItems = []
         for x in xrange(count):
-            packet = self._selectionService.ByIndex(self._itemSelTypeCode, x)
-            rawItem = lxu.object.Item(self._itemPacketTranslation.Item(packet))
-            if rawItem.Type() == itemType:
-                rawItems.append(rawItem)
+            handle = pktItem(byIndex(code, x))
+            probe.set(handle)
+            if probe.Type() == itemType:
+                rawItems.append(RawItem(handle))
         return rawItems
     
     def getOfTypeModo(self, itemType):
@@ -192,7 +239,8 @@ class ItemSelection(object):
             One of SelectionMode.XXX constants.
 
         batch : bool
-            When True batch mode will be set for selection when selection is larget then 1 item.
+            When True selection changes are wrapped in a batch so listeners
+            get a single notification instead of one per item.
         """
         if selMode == SelectionMode.REPLACE:
             self._selectionService.Clear(self._itemSelTypeCode)
@@ -202,19 +250,22 @@ class ItemSelection(object):
         if not isinstance(itemList, list):
             itemList = [itemList]
 
-        if len(itemList) > 1 and batch:
+        if batch:
             self._selectionService.StartBatch()
 
+        code = self._itemSelTypeCode
+        Packet = self._itemPacketTranslation.Packet
+
         if selMode == SelectionMode.SUBSTRACT:
+            Deselect = self._selectionService.Deselect
             for item in itemList:
-                selection_packet_pointer = self._itemPacketTranslation.Packet(item)
-                self._selectionService.Deselect(self._itemSelTypeCode, selection_packet_pointer)
+                Deselect(code, Packet(item))
         else:
+            Select = self._selectionService.Select
             for item in itemList:
-                selection_packet_pointer = self._itemPacketTranslation.Packet(item)
-                self._selectionService.Select(self._itemSelTypeCode, selection_packet_pointer)
+                Select(code, Packet(item))
 
-        if len(itemList) > 1 and batch:
+        if batch:
             self._selectionService.EndBatch()
         return True
 
@@ -254,17 +305,17 @@ class ItemSelection(object):
         """Return a list of raw selection packets.
 
         """
-        a = []
-        for i in range(self._selectionService.Count(self._itemSelTypeCode)):
-            a.append(self._selectionService.ByIndex(self._itemSelTypeCode, i))
+        code = self._itemSelTypeCode
+        byIndex = self._selectionService.ByIndex
+        count = self._selectionService.Count(code)
 
-        return a
+        return [byIndex(code, i) for i in xrange(count)]
 
     def __init__(self):
-        self._selectionService = lx.service.Selection()
-        self._sceneService = lx.service.Scene()
+        self._selectionService = _selectionService
+        self._sceneService = _sceneService
         self._itemSelectionType = lx.symbol.sSELTYP_ITEM
-        self._itemSelTypeCode = self._selectionService.LookupType(self._itemSelectionType)
+        self._itemSelTypeCode = _lookupSelectionType(lx.symbol.sSELTYP_ITEM)
         self._itemPacketTranslation = lx.object.ItemPacketTranslation(self._selectionService.Allocate(lx.symbol.sSELTYP_ITEM))
 
 
@@ -288,13 +339,18 @@ class ChannelSelection(object):
         chans = []
         chanCount = self._selectionService.Count(self._chanSeltypeCode)
 
+        code = self._chanSeltypeCode
+        byIndex = self._selectionService.ByIndex
+        pktIndex = self._chanTranspacket.Index
+        pktItem = self._chanTranspacket.Item
+
         for x in xrange(chanCount):
-            packetPointer = self._selectionService.ByIndex(self._chanSeltypeCode, x)
+            packetPointer = byIndex(code, x)
             if not packetPointer:
                 continue
-            
-            index = self._chanTranspacket.Index(packetPointer)
-            item = modo.Item(lx.object.Item(self._chanTranspacket.Item(packetPointer)))
+
+            index = pktIndex(packetPointer)
+            item = modo.Item(lx.object.Item(pktItem(packetPointer)))
             chans.append(modo.Channel(index, item))
 
         return chans
@@ -316,7 +372,7 @@ class ChannelSelection(object):
 
         if not chanList:
             return False
-        if type(chanList) not in (list, tuple):
+        if not isinstance(chanList, (list, tuple)):
             chanList = [chanList]
 
         if selMode == SelectionMode.SUBSTRACT:
@@ -334,8 +390,8 @@ class ChannelSelection(object):
     def __init__(self):
         self._scene = lxu.select.SceneSelection().current()
 
-        self._selectionService = lx.service.Selection()
-        self._chanSeltypeCode = self._selectionService.LookupType(lx.symbol.sSELTYP_CHANNEL)
+        self._selectionService = _selectionService
+        self._chanSeltypeCode = _lookupSelectionType(lx.symbol.sSELTYP_CHANNEL)
         self._chanTranspacket = lx.object.ChannelPacketTranslation(self._selectionService.Allocate(lx.symbol.sSELTYP_CHANNEL))
         
 
@@ -359,18 +415,11 @@ class VertexMapSelection:
         # TODO: Seems a bit unreliable on modo's side?
         # I'm getting weird selections sometimes
         """
-        self._storeWeight = None
-        self._storeMorph = None
-        self._storeTexuv = None
-
-        if weight:
-            self._storeWeight = self.get([lx.symbol.i_VMAP_WEIGHT])
-
-        if morph:
-            self._storeMorph = self.get([lx.symbol.i_VMAP_MORPH])
+        groups = self.getGrouped()
 
-        if uv:
-            self._storeTexuv = self.get([lx.symbol.i_VMAP_TEXTUREUV])
+        self._storeWeight = groups[lx.symbol.i_VMAP_WEIGHT] if weight else None
+        self._storeMorph = groups[lx.symbol.i_VMAP_MORPH] if morph else None
+        self._storeTexuv = groups[lx.symbol.i_VMAP_TEXTUREUV] if uv else None
 
     def restore(self):
         """ Restores backed up selection.
@@ -422,18 +471,53 @@ class VertexMapSelection:
         if not vmaps_n:
             return vmaps
 
-        if type(vmapTypes) not in (list, tuple):
+        if not isinstance(vmapTypes, (list, tuple)):
             vmapTypes = [vmapTypes]
+        # Frozenset gives constant time membership test in the loop below.
+        vmapTypes = frozenset(vmapTypes)
+
+        code = self._vmapSeltypeCode
+        byIndex = self._selectService.ByIndex
+        pktType = self._vmapTranspacket.Type
+        pktName = self._vmapTranspacket.Name
 
         for x in xrange(vmaps_n):
-            packet_pointer = self._selectService.ByIndex(self._vmapSeltypeCode, x)
+            packet_pointer = byIndex(code, x)
             if not packet_pointer:
                 continue
-            if vmapTypes and not self._vmapTranspacket.Type(packet_pointer) in vmapTypes:
+            if vmapTypes and pktType(packet_pointer) not in vmapTypes:
                 continue
-            vmaps.append(self._vmapTranspacket.Name(packet_pointer))
+            vmaps.append(pktName(packet_pointer))
         return vmaps
 
+    def getGrouped(self):
+        """ Returns selected vertex map names grouped by map type.
+
+        A single pass over the selection, unlike calling get() with
+        a filter once per map type.
+
+        Returns
+        -------
+        dict
+            Keys are the lx.symbol.i_VMAP_XXX types from VMAPTYPE_STRINGS,
+            values are lists of selected map names (possibly empty).
+        """
+        groups = dict((vmapType, []) for vmapType in self.VMAPTYPE_STRINGS)
+
+        code = self._vmapSeltypeCode
+        byIndex = self._selectService.ByIndex
+        pktType = self._vmapTranspacket.Type
+        pktName = self._vmapTranspacket.Name
+
+        for x in xrange(self._selectService.Count(code)):
+            packet_pointer = byIndex(code, x)
+            if not packet_pointer:
+                continue
+            names = groups.get(pktType(packet_pointer))
+            if names is not None:
+                names.append(pktName(packet_pointer))
+        return groups
+
     def set(self, vmapList, vmapType, mode=SelectionMode.REPLACE):
         """ Sets vertex map selection according to the list.
         
@@ -453,7 +537,7 @@ class VertexMapSelection:
 
         if not vmapList:
             return
-        if isinstance(vmapList, list) == False:
+        if not isinstance(vmapList, (list, tuple)):
             vmapList = [vmapList]
 
         if len(vmapList) > 1:
@@ -508,16 +592,19 @@ class VertexMapSelection:
         if not isinstance(vmapList, list):
             vmapList = [vmapList]
 
-        for vmapName in vmapList:
-            run('!select.vertexMap name:{%s} type:{%s} mode:{%s}' % (vmapName, vmapTypeString, selModeString))
+        # select.vertexMap takes a single map name per invocation so the
+        # per-name commands stay; they are prebuilt and fired through
+        # runMany() which resolves the error log once for the whole batch.
+        cmd = '!select.vertexMap name:{%s} type:{' + vmapTypeString + '} mode:{' + selModeString + '}'
+        runMany([cmd % vmapName for vmapName in vmapList])
 
     # -------- Private methods
 
     def __init__ (self):
         self._scene = lxu.select.SceneSelection().current()
 
-        self._selectService = lx.service.Selection()
-        self._vmapSeltypeCode = self._selectService.LookupType(lx.symbol.sSELTYP_VERTEXMAP)
+        self._selectService = _selectionService
+        self._vmapSeltypeCode = _lookupSelectionType(lx.symbol.sSELTYP_VERTEXMAP)
         self._vmapTranspacket = lx.object.VMapPacketTranslation(self._selectService.Allocate(lx.symbol.sSELTYP_VERTEXMAP))
 
         self._storeWeight = None
@@ -549,9 +636,18 @@ class MeshComponentSelection:
     def packetTranslationClass(self):
         pass
 
-    def initModoObject(self, packetPointer):
+    def initModoObject(self, packetPointer, meshCache):
         pass
-        
+
+    def elementId(self, packetPointer):
+        """ Needs to return the raw element id(s) for a selection packet.
+
+        Returns
+        -------
+        int, tuple of int
+        """
+        pass
+
     # -------- Implementation
 
     def clear(self):
@@ -579,21 +675,76 @@ class MeshComponentSelection:
         elements = []
         elementCount = self._selectionService.Count(self._compSeltypeCode)
 
+        code = self._compSeltypeCode
+        byIndex = self._selectionService.ByIndex
+        initModoObject = self.initModoObject
+
+        # Mesh wrappers are shared between elements of the same mesh
+        # within this call, see _meshEntry().
+        meshCache = {}
+
         for x in xrange(elementCount):
-            packet_pointer = self._selectionService.ByIndex(self._compSeltypeCode, x)
+            packet_pointer = byIndex(code, x)
             if not packet_pointer:
                 continue
 
-            element = self.initModoObject(packet_pointer)
-            elements.append(element)
+            elements.append(initModoObject(packet_pointer, meshCache))
 
         return elements
 
+    def getGroupedIds(self):
+        """ Gets selected element ids grouped by mesh.
+
+        This is the batch friendly alternative to get(): no element
+        wrappers are constructed, each mesh appears once together with
+        a plain list of integer element ids that callers can process
+        in bulk.
+
+        Returns
+        -------
+        list of tuples (modo.Mesh, list of int)
+            Meshes appear in the order their first element was selected.
+        """
+        code = self._compSeltypeCode
+        byIndex = self._selectionService.ByIndex
+        pktItem = self._transpacket.Item
+        elementId = self.elementId
+
+        groups = {}
+        order = []
+        for x in xrange(self._selectionService.Count(code)):
+            packet_pointer = byIndex(code, x)
+            if not packet_pointer:
+                continue
+
+            item = pktItem(packet_pointer)
+            ident = lx.object.Item(item).Ident()
+            entry = groups.get(ident)
+            if entry is None:
+                entry = (modo.Mesh(item), [])
+                groups[ident] = entry
+                order.append(entry)
+            entry[1].append(elementId(packet_pointer))
+        return order
+
     # -------- Private methods
 
+    def _meshEntry(self, item, meshCache):
+        """ Gets (modo.Mesh, modo.MeshGeometry) for a given raw mesh item.
+
+        Wrappers are memoized in meshCache by item ident so a selection
+        of thousands of components on one mesh constructs them once.
+        """
+        ident = lx.object.Item(item).Ident()
+        entry = meshCache.get(ident)
+        if entry is None:
+            entry = (modo.Mesh(item), modo.MeshGeometry(item, mode='read'))
+            meshCache[ident] = entry
+        return entry
+
     def __init__(self):
-        self._selectionService = lx.service.Selection()
-        self._compSeltypeCode = self._selectionService.LookupType(self.componentType)
+        self._selectionService = _selectionService
+        self._compSeltypeCode = _lookupSelectionType(self.componentType)
         self._transpacket = self.packetTranslationClass(self._selectionService.Allocate(self.componentType))
 
 
@@ -607,13 +758,15 @@ class VertexSelection(MeshComponentSelection):
     def packetTranslationClass(self):
         return lx.object.VertexPacketTranslation
 
-    def initModoObject(self, packetPointer):
+    def elementId(self, packetPointer):
+        return self._transpacket.Vertex(packetPointer)
+
+    def initModoObject(self, packetPointer, meshCache):
         item = self._transpacket.Item(packetPointer)
         elementId = self._transpacket.Vertex(packetPointer)
-    
-        mesh = modo.Mesh(item)
-        geo = modo.MeshGeometry(item, mode='read')
-        
+
+        mesh, geo = self._meshEntry(item, meshCache)
+
         # Mesh Vertex interprets long index parameter as id,
         # and int as index.
         # So if we want initialise MeshVertex with id it needs
@@ -631,14 +784,16 @@ class EdgeSelection(MeshComponentSelection):
     @property
     def packetTranslationClass(self):
         return lx.object.EdgePacketTranslation
-    
-    def initModoObject(self, packetPointer):
+
+    def elementId(self, packetPointer):
+        return self._transpacket.Vertices(packetPointer)
+
+    def initModoObject(self, packetPointer, meshCache):
         item = self._transpacket.Item(packetPointer)
         id1, id2 = self._transpacket.Vertices(packetPointer)
-    
-        mesh = modo.Mesh(item)
-        geo = modo.MeshGeometry(item, mode='read')
-        
+
+        mesh, geo = self._meshEntry(item, meshCache)
+
         return (mesh, modo.MeshEdge((long(id1), long(id2)), geo))
 
 
@@ -651,18 +806,34 @@ class PolygonSelection(MeshComponentSelection):
     @property
     def packetTranslationClass(self):
         return lx.object.PolygonPacketTranslation
-    
-    def initModoObject(self, packetPointer):
+
+    def elementId(self, packetPointer):
+        return self._transpacket.Polygon(packetPointer)
+
+    def initModoObject(self, packetPointer, meshCache):
         item = self._transpacket.Item(packetPointer)
         pid = self._transpacket.Polygon(packetPointer)
 
-        mesh = modo.Mesh(item)
-        geo = modo.MeshGeometry(item, mode='read')
-        
-        polyAccess = geo.polygons.accessor
+        mesh, geo, polyAccess = self._meshEntry(item, meshCache)
+
         polyAccess.Select(pid)
         index = polyAccess.Index()
         return (mesh, modo.MeshPolygon(index, geo))
+
+    # -------- Private methods
+
+    def _meshEntry(self, item, meshCache):
+        """ Same as the base entry but with the polygon accessor cached
+        so the polygons property chain is not re-walked per element.
+        """
+        ident = lx.object.Item(item).Ident()
+        entry = meshCache.get(ident)
+        if entry is None:
+            mesh = modo.Mesh(item)
+            geo = modo.MeshGeometry(item, mode='read')
+            entry = (mesh, geo, geo.polygons.accessor)
+            meshCache[ident] = entry
+        return entry
         
         
 class SelectionUtils(object):
@@ -675,17 +846,17 @@ class SelectionUtils(object):
         -------
         list of tuples (modo.Mesh, modo.MeshVertex)
         """
-        vsel = bool(lx.eval('item.componentMode vertex ?'))
-        if vsel:
+        # One selection mode query replaces the three separate
+        # item.componentMode command probes this used to fire.
+        mode = lx.eval('query layoutservice selmode ?')
+        if mode == 'vertex':
             vertexSelection = VertexSelection()
             return vertexSelection.get()
-        esel = bool(lx.eval('item.componentMode edge ?'))
-        if esel:
+        if mode == 'edge':
             edgeSelection = EdgeSelection()
             edges = edgeSelection.get()
             return cls._edgesToVertices(edges)
-        psel = bool(lx.eval('item.componentMode polygon ?'))
-        if psel:
+        if mode == 'polygon':
             polySelection = PolygonSelection()
             polys = polySelection.get()
             return cls._polygonsToVertices(polys)
@@ -694,12 +865,21 @@ class SelectionUtils(object):
     
     @classmethod
     def _polygonsToVertices(cls, components):
-        vertices = {}
+        # Dedup goes through a set of integer indexes with a parallel
+        # result list; only unseen vertices pay for the tuple build.
+        seen = set()
+        seenAdd = seen.add
+        vertices = []
+        append = vertices.append
         for comp in components:
+            mesh = comp[0]
             for v in comp[1].vertices:
-                if not vertices.has_key(v.index):
-                    vertices[v.index] = (comp[0], v)
-        return vertices.values()
+                index = v.index
+                if index in seen:
+                    continue
+                seenAdd(index)
+                append((mesh, v))
+        return vertices
 
     @classmethod
     def _edgesToVertices(cls, edges):
@@ -707,6 +887,6 @@ class SelectionUtils(object):
         for edge in edges:
             vid1, vid2 = edge[1].accessor.Endpoints()
             for vid in (vid1, vid2):
-                if not vertices.has_key(vid):
+                if vid not in vertices:
                     vertices[vid] = (edge[0], modo.MeshVertex(long(vid), edge[0].geometry))
         return vertices.values()
\ No newline at end of file
@@ -8,9 +8,20 @@ class TransformToolsUtils(object):
     """ Utility class for switching transform tools on/off.
     """
 
-    POS_CHANNELS = ['pos.X', 'pos.Y', 'pos.Z']
-    ROT_CHANNELS = ['rot.X', 'rot.Y', 'rot.Z']
-    SCALE_CHANNELS = ['scl.X', 'scl.Y', 'scl.Z']
+    POS_CHANNELS = frozenset(('pos.X', 'pos.Y', 'pos.Z'))
+    ROT_CHANNELS = frozenset(('rot.X', 'rot.Y', 'rot.Z'))
+    SCALE_CHANNELS = frozenset(('scl.X', 'scl.Y', 'scl.Z'))
+
+    # Item command strings only come in the off/on flavours so both are
+    # frozen here, indexed by the boolean state.
+    _MOVE_ITEM_CMDS = ('eval {tool.set TransformMoveItem 0}',
+                       'eval {tool.set TransformMoveItem 1}')
+    _ROTATE_ITEM_CMDS = ('eval {tool.set TransformRotateItem 0}',
+                         'eval {tool.set TransformRotateItem 1}')
+    _SCALE_ITEM_CMDS = ('eval {tool.set TransformScaleItem 0}',
+                        'eval {tool.set TransformScaleItem 1}')
+    _TRANSFORM_ITEM_CMDS = ('eval {tool.set TransformItem 0}',
+                            'eval {tool.set TransformItem 1}')
 
     def autoFromChannels(self, xfrmChannels):
         """ Enables transform tools based on given channels list.
@@ -24,17 +35,8 @@ class TransformToolsUtils(object):
         ----------
         xfrmChannels : list of modo.Channel
         """
-        xfrmChanNames = [chan.name for chan in xfrmChannels]
-
-        doMove = self._testChannels(self.POS_CHANNELS, xfrmChanNames)
-        doRotate = self._testChannels(self.ROT_CHANNELS, xfrmChanNames)
-        doScale = self._testChannels(self.SCALE_CHANNELS, xfrmChanNames)
-
-        transforms = int(doMove) + int(doRotate) + int(doScale)
-        if transforms == 1:
-            self._setSingleTransformTool(doMove, doRotate, doScale)
-        elif transforms > 1:
-            self._setTransformItemTool()
+        doMove, doRotate, doScale = self._classify(xfrmChannels)
+        self._applyClassified(doMove, doRotate, doScale)
 
     def getToolItemCommandStringFromChannels(self, xfrmChannels):
         """
@@ -52,23 +54,27 @@ class TransformToolsUtils(object):
         -------
         str, None
         """
-        xfrmChanNames = [chan.name for chan in xfrmChannels]
+        doMove, doRotate, doScale = self._classify(xfrmChannels)
+        return self._commandStringFromClassified(doMove, doRotate, doScale)
 
-        doMove = self._testChannels(self.POS_CHANNELS, xfrmChanNames)
-        doRotate = self._testChannels(self.ROT_CHANNELS, xfrmChanNames)
-        doScale = self._testChannels(self.SCALE_CHANNELS, xfrmChanNames)
+    def applyAndGetCommand(self, xfrmChannels):
+        """ Enables transform tools and gets the matching command string.
 
-        transforms = int(doMove) + int(doRotate) + int(doScale)
-        if transforms == 1:
-            if doMove:
-                return self.getMoveItemCommandString(True)
-            elif doRotate:
-                return self.getRotateItemCommandString(True)
-            elif doScale:
-                return self.getScaleItemCommandString(True)
-        elif transforms > 1:
-            return self.getTransformItemCommandString(True)
-        return None
+        Same as calling autoFromChannels() followed by
+        getToolItemCommandStringFromChannels() except the channels are
+        classified only once.
+
+        Parameters
+        ----------
+        xfrmChannels : [modo.Channel]
+
+        Returns
+        -------
+        str, None
+        """
+        doMove, doRotate, doScale = self._classify(xfrmChannels)
+        self._applyClassified(doMove, doRotate, doScale)
+        return self._commandStringFromClassified(doMove, doRotate, doScale)
 
     @property
     def moveItem(self):
@@ -76,10 +82,10 @@ class TransformToolsUtils(object):
     
     @moveItem.setter
     def moveItem(self, state):
-        lx.eval('!tool.set TransformMove %d' % int(state))
+        lx.command('tool.set', preset='TransformMove', mode=int(state))
 
     def getMoveItemCommandString(self, state):
-        return 'eval {tool.set TransformMoveItem %d}' % int(state)
+        return self._MOVE_ITEM_CMDS[int(bool(state))]
 
     @property
     def rotateItem(self):
@@ -87,10 +93,10 @@ class TransformToolsUtils(object):
     
     @rotateItem.setter
     def rotateItem(self, state):
-        lx.eval('!tool.set TransformRotate %d' % int(state))
+        lx.command('tool.set', preset='TransformRotate', mode=int(state))
 
     def getRotateItemCommandString(self, state):
-        return 'eval {tool.set TransformRotateItem %s}' % int(state)
+        return self._ROTATE_ITEM_CMDS[int(bool(state))]
 
     @property
     def scaleItem(self):
@@ -98,10 +104,10 @@ class TransformToolsUtils(object):
     
     @scaleItem.setter
     def scaleItem(self, state):
-        lx.eval('!tool.set TransformScale %d' % int(state))
+        lx.command('tool.set', preset='TransformScale', mode=int(state))
 
     def getScaleItemCommandString(self, state):
-        return 'eval {tool.set TransformScaleItem %s}' % int(state)
+        return self._SCALE_ITEM_CMDS[int(bool(state))]
 
     @property
     def transformItem(self):
@@ -109,10 +115,10 @@ class TransformToolsUtils(object):
 
     @transformItem.setter
     def transformItem(self, state):
-        lx.eval('!tool.set Transform %d' % int(state))
+        lx.command('tool.set', preset='Transform', mode=int(state))
 
     def getTransformItemCommandString(self, state):
-        return 'eval {tool.set TransformItem %d}' % int(state)
+        return self._TRANSFORM_ITEM_CMDS[int(bool(state))]
 
     @property
     def childCompensation(self):
@@ -143,38 +149,66 @@ class TransformToolsUtils(object):
 
     # -------- Private methods
 
+    def _classify(self, xfrmChannels):
+        """ Classifies channels into move/rotate/scale flags.
+
+        Returns
+        -------
+        bool, bool, bool
+        """
+        xfrmChanNames = frozenset(chan.name for chan in xfrmChannels)
+
+        return (self._testChannels(self.POS_CHANNELS, xfrmChanNames),
+                self._testChannels(self.ROT_CHANNELS, xfrmChanNames),
+                self._testChannels(self.SCALE_CHANNELS, xfrmChanNames))
+
+    def _applyClassified(self, doMove, doRotate, doScale):
+        transforms = int(doMove) + int(doRotate) + int(doScale)
+        if transforms == 1:
+            self._setSingleTransformTool(doMove, doRotate, doScale)
+        elif transforms > 1:
+            self._setTransformItemTool()
+
+    def _commandStringFromClassified(self, doMove, doRotate, doScale):
+        transforms = int(doMove) + int(doRotate) + int(doScale)
+        if transforms == 1:
+            if doMove:
+                return self.getMoveItemCommandString(True)
+            elif doRotate:
+                return self.getRotateItemCommandString(True)
+            elif doScale:
+                return self.getScaleItemCommandString(True)
+        elif transforms > 1:
+            return self.getTransformItemCommandString(True)
+        return None
+
     def _setSingleTransformTool(self, move, rotate, scale):
+        # Enabling an already active tool is a no-op on modo's side and
+        # cheaper then querying the state first, so no pre-checks here.
         if move:
-            if not self.moveItem:
-                self.moveItem = True
+            self.moveItem = True
         elif rotate:
-            if not self.rotateItem:
-                self.rotateItem = True
+            self.rotateItem = True
         elif scale:
-            if not self.scaleItem:
-                self.scaleItem = True
+            self.scaleItem = True
 
     def _setTransformItemTool(self):
-        if not self.transformItem:
-            self.transformItem = True
+        self.transformItem = True
 
     def _testChannels(self, chansToTest, chanList):
         """ Tests if any of given channels to test is on the channel list.
-        
+
         Note that arguments for this method are channel names not channel objects!
-        
+
         Parameters
         ----------
-        chansToTest : list of str
-            List of names of channels to test against being on the channels list.
-        chanList : list of str
-            List of names of channels that the other list will be tested against.
-        
+        chansToTest : frozenset of str
+            Names of channels to test against being on the channels list.
+        chanList : frozenset of str
+            Names of channels that the other set will be tested against.
+
         Returns
         -------
         bool
         """
-        for chanName in chansToTest:
-            if chanName in chanList:
-                return True
-        return False
\ No newline at end of file
+        return not chansToTest.isdisjoint(chanList)
\ No newline at end of file
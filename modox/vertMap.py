@@ -5,6 +5,14 @@ import modo
 import const as c
 
 
+# Command templates used by transferWeights(), frozen here so the loop
+# only pays for filling arguments in.
+_CMD_SELECT_WEIGHT_MAP = 'select.vertexMap {%s} wght replace'
+_CMD_TRANSFER_WEIGHTS = 'vertMap.transfer {%s} weight local %s off true'
+_CMD_TEST_EMPTY_MAP = 'rs.vertexMap.empty ? type:wght name:{%s}'
+_CMD_DELETE_WEIGHT_MAP = 'vertMap.deleteByName wght {%s}'
+
+
 class VertexMapUtils(object):
 
     @classmethod
@@ -47,9 +55,13 @@ class VertexMapUtils(object):
 
         # Add weight maps to the target mesh.
         with modo.Mesh(meshTo).geometry as geo:
+            # Snapshot existing map names once, indexing geo.vmaps scans
+            # the whole map collection per lookup.
+            existingMapNames = set(vmap.name for vmap in geo.vmaps)
             for wmapName in wmapsList:
-                if not geo.vmaps[wmapName]: # This returns empty list if vertex map is not on the item.
+                if wmapName not in existingMapNames:
                     geo.vmaps.addWeightMap(wmapName)
+                    existingMapNames.add(wmapName)
             geo.setMeshEdits()
 
         if monitor:
@@ -62,21 +74,26 @@ class VertexMapUtils(object):
         meshFrom.select(replace=True)
         meshTo.select(replace=True)
 
+        lxeval = lx.eval
+
         for wmapName in wmapsList:
             # Select weight map to which data will be transfered.
-            lx.eval('select.vertexMap %s wght replace' % wmapName)
-            lx.eval('vertMap.transfer {%s} weight local %s off true' % (wmapName, method))
+            lxeval(_CMD_SELECT_WEIGHT_MAP % wmapName)
+            lxeval(_CMD_TRANSFER_WEIGHTS % (wmapName, method))
+
+            # Optimize unused deformers.
+            # The emptiness test runs right after the transfer because
+            # the rs.vertexMap.empty command works off currently selected
+            # map - its arguments are not implemented yet - and the map
+            # is still selected here. This spares the cleanup pass that
+            # had to reselect every map a second time.
+            if skipEmptyMaps:
+                isEmpty = lxeval(_CMD_TEST_EMPTY_MAP % wmapName)
+                if isEmpty:
+                    lxeval(_CMD_DELETE_WEIGHT_MAP % wmapName)
+
             if monitor:
                 monitor.tick(tick)
 
-        # Optimize unused deformers.
-        if skipEmptyMaps:
-            for wmapName in wmapsList:
-                # Need to select weight map for now because the rs.vertexMap.empty command
-                # works off currently selecte map - its arguments are not implmeented yet.
-                lx.eval('select.vertexMap {%s} wght replace' % wmapName)
-                isEmpty = lx.eval('rs.vertexMap.empty ? type:wght name:{%s}' % wmapName)
-                if isEmpty:
-                    lx.eval('vertMap.deleteByName wght {%s}' % wmapName)
-
-        monitor.tick(tick * 2.0)
+        if monitor:
+            monitor.tick(tick * 2.0)
@@ -5,6 +5,14 @@ import lxu
 import modo
 
 
+# Viewport service is a singleton on modo's side, one module level handle
+# avoids re-fetching it on every mouse move query. The MO3D space code is
+# precomputed so views can be tested with a plain int compare instead of
+# decoding their space to a string each time.
+_viewService = lx.service.View3Dport()
+_MO3D_ID4 = lxu.lxID4('MO3D')
+
+
 class ViewUtils(object):
 
     MAX_VIEWPORT_WIDTH = 16384
@@ -25,8 +33,14 @@ class ViewUtils(object):
             Note that in MODO some parts of UI work as 3d view even though
             they are not in user's sense (script editor, info panel at the bottom of layout).
         """
-        viewService = lx.service.View3Dport()
-        mouseView, x, y = viewService.Mouse()
+        mouseView, x, y = _viewService.Mouse()
+
+        # Index -1 means no 3d view but it really happens rarely that -1 is returned
+        # for whatever reason. Most of MODO UI still returns 0 or other valid number.
+        # It could be because of QT view qualifying as model 3d view?
+        # So this is initial check only, it works poorly.
+        if mouseView < 0:
+            return None
 
         # Some views that are cleary not model views but still return valid index
         # and space will return fixed 0,0 coordinates.
@@ -40,24 +54,16 @@ class ViewUtils(object):
         if x >= cls.MAX_VIEWPORT_WIDTH or y >= cls.MAX_VIEWPORT_HEIGHT:
             return None
 
-        # Index -1 means no 3d view but it really happens rarely that -1 is returned
-        # for whatever reason. Most of MODO UI still returns 0 or other valid number.
-        # It could be because of QT view qualifying as model 3d view?
-        # So this is initial check only, it works poorly.
-        if mouseView < 0:
-            return None
-    
         # We need to initialise the view and check if it's really a valid 3d view.
         # The intialisation will fail if mouse is not over 3d view.
         # That's the best way to check if we're really over 3d view.
         try:
-            view = lx.object.View3D(viewService.View(mouseView))
+            view = lx.object.View3D(_viewService.View(mouseView))
         except IndexError:
             return None
-    
+
         # Confirm the space, 3d view is of MO3D type.
-        space = lxu.decodeID4(view.Space())
-        if space != 'MO3D':
+        if view.Space() != _MO3D_ID4:
             return None
     
         # Pos can also be None in some cases.
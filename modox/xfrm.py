@@ -4,8 +4,26 @@ import lx
 import modo
 
 
+# Selection service is a singleton on modo's side, used for current time reads.
+_selectionService = lx.service.Selection()
+
+
 class TransformUtils(object):
 
+    # Rotation orders memoized by (rotation item ident, time) and primary
+    # rotation items by locator ident, see getRotationOrder().
+    # The order memo gains an entry per queried item for every new time
+    # so it is cleared once it hits the limit, same as the offset cache
+    # in dyna_parent.
+    _rotationOrderCache = {}
+    _ROTATION_ORDER_CACHE_LIMIT = 4096
+    _primaryRotationItems = {}
+    _orderChannels = {}
+
+    # Scratch matrix reused by applyTransform() for setting scale,
+    # allocated lazily on first use.
+    _scratchScaleM4 = None
+
     @classmethod
     def applyEdit(cls):
         """ Applies edits from edit action.
@@ -28,21 +46,12 @@ class TransformUtils(object):
         -------
         raw SDK matrix (a list of lists)
         """
-        rawMatrix = [[1,0,0], [0,1,0], [0,0,1]]
-    
-        rawMatrix[0][0] = matrix3.m[0][0]
-        rawMatrix[1][0] = matrix3.m[0][1]
-        rawMatrix[2][0] = matrix3.m[0][2]
-    
-        rawMatrix[0][1] = matrix3.m[1][0]
-        rawMatrix[1][1] = matrix3.m[1][1]
-        rawMatrix[2][1] = matrix3.m[1][2]
-    
-        rawMatrix[0][2] = matrix3.m[2][0]
-        rawMatrix[1][2] = matrix3.m[2][1]
-        rawMatrix[2][2] = matrix3.m[2][2]
-
-        return rawMatrix
+        # The raw matrix is simply the transpose, built in one go from
+        # a single read of the m property.
+        m = matrix3.m
+        return [[m[0][0], m[1][0], m[2][0]],
+                [m[0][1], m[1][1], m[2][1]],
+                [m[0][2], m[1][2], m[2][2]]]
 
     @classmethod
     def applyTransform(cls,
@@ -67,28 +76,61 @@ class TransformUtils(object):
         
         mode : lx.symbol.iLOCATOR_LOCAL, lx.symbol.iLOCATOR_WORLD
         
+        action : lx.symbol.s_ACTIONLAYER_XXX
+            Action to store values on.
+        """
+        cls.applyTransforms(
+            [(modoItem, positionVector, orientationMat3, scaleVector)],
+            mode,
+            action)
+
+    @classmethod
+    def applyTransforms(cls,
+        entries,
+        mode=lx.symbol.iLOCATOR_LOCAL,
+        action=lx.symbol.s_ACTIONLAYER_SETUP):
+        """ Applies transforms to a batch of items.
+
+        The scene and its channel read/write accessors are constructed
+        once for the whole batch so bake/import loops don't pay for them
+        per item.
+
+        Paramters
+        ---------
+        entries : iterable of tuples
+            (modoItem, positionVector, orientationMat3, scaleVector)
+            tuples, each transform part can be None to leave it untouched.
+
+        mode : lx.symbol.iLOCATOR_LOCAL, lx.symbol.iLOCATOR_WORLD
+
         action : lx.symbol.s_ACTIONLAYER_XXX
             Action to store values on.
         """
         scene = modo.Scene().scene
         channelRead = scene.Channels(None, 0.0)
         channelWrite = scene.Channels(action, 0.0)
-    
-        loc = lx.object.Locator(modoItem.internalItem)
 
-        if positionVector is not None:
-            loc.SetPosition(channelRead, channelWrite, positionVector.values, mode, 0)
-        
-        if orientationMat3 is not None:
-            orientation = cls.convertModoMatrix3ToRawMatrix(orientationMat3)
-            loc.SetRotation(channelRead, channelWrite, orientation, mode, 0)
-
-        if scaleVector is not None:
-            scaleM4 = modo.Matrix4()
-            scaleM4.m[0][0] = scaleVector[0]
-            scaleM4.m[1][1] = scaleVector[1]
-            scaleM4.m[2][2] = scaleVector[2]
-            loc.SetScale(channelRead, channelWrite, scaleM4, mode, 0)
+        for modoItem, positionVector, orientationMat3, scaleVector in entries:
+            loc = lx.object.Locator(modoItem.internalItem)
+
+            if positionVector is not None:
+                loc.SetPosition(channelRead, channelWrite, positionVector.values, mode, 0)
+
+            if orientationMat3 is not None:
+                orientation = cls.convertModoMatrix3ToRawMatrix(orientationMat3)
+                loc.SetRotation(channelRead, channelWrite, orientation, mode, 0)
+
+            if scaleVector is not None:
+                scaleM4 = cls._scratchScaleM4
+                if scaleM4 is None:
+                    scaleM4 = cls._scratchScaleM4 = modo.Matrix4()
+                # The full diagonal is overwritten on each call and the rest
+                # of the matrix is never touched so no reset is needed.
+                m = scaleM4.m
+                m[0][0] = scaleVector[0]
+                m[1][1] = scaleVector[1]
+                m[2][2] = scaleVector[2]
+                loc.SetScale(channelRead, channelWrite, scaleM4, mode, 0)
         
     @classmethod
     def getRotationOrder(cls, rotationItem):
@@ -106,8 +148,40 @@ class TransformUtils(object):
             Rotation order as text hint ('xyz', 'zxy', etc.)
         """
         if rotationItem.type != 'rotation':
-            rotationItem = modo.LocatorSuperType(rotationItem).rotation
-        return rotationItem.channel('order').get()
+            locIdent = rotationItem.id
+            primaryRotation = cls._primaryRotationItems.get(locIdent)
+            if primaryRotation is None:
+                primaryRotation = modo.LocatorSuperType(rotationItem).rotation
+                cls._primaryRotationItems[locIdent] = primaryRotation
+            rotationItem = primaryRotation
+
+        rotIdent = rotationItem.id
+        key = (rotIdent, _selectionService.GetTime())
+        order = cls._rotationOrderCache.get(key)
+        if order is None:
+            # The channel handle itself is cached too, resolving it
+            # indexes the item's channel collection by name.
+            orderChannel = cls._orderChannels.get(rotIdent)
+            if orderChannel is None:
+                orderChannel = rotationItem.channel('order')
+                cls._orderChannels[rotIdent] = orderChannel
+            order = orderChannel.get()
+            if len(cls._rotationOrderCache) >= cls._ROTATION_ORDER_CACHE_LIMIT:
+                cls._rotationOrderCache.clear()
+            cls._rotationOrderCache[key] = order
+        return order
+
+    @classmethod
+    def clearRotationOrderCache(cls):
+        """ Clears rotation orders memoized by getRotationOrder().
+
+        Cached entries are not invalidated automatically so call this
+        after switching scenes or when rotation setups could have been
+        edited.
+        """
+        cls._rotationOrderCache = {}
+        cls._primaryRotationItems = {}
+        cls._orderChannels = {}
     
     @classmethod
     def linkWorldTransforms(cls, itemSource, itemTarget, linkPos=True, linkRot=True, linkScale=True):
@@ -120,20 +194,39 @@ class TransformUtils(object):
         
         itemTarget : modo.Item
         """
+        pairs = []
         if linkPos:
-            sourcewpos = itemSource.channel('wposMatrix')
-            targetwpos = itemTarget.channel('wposMatrix')
-            sourcewpos >> targetwpos
+            pairs.append((itemSource.channel('wposMatrix'), itemTarget.channel('wposMatrix')))
 
         if linkRot:
-            sourcewrot = itemSource.channel('wrotMatrix')
-            targetwrot = itemTarget.channel('wrotMatrix')
-            sourcewrot >> targetwrot
+            pairs.append((itemSource.channel('wrotMatrix'), itemTarget.channel('wrotMatrix')))
 
         if linkScale:
-            sourcewscl = itemSource.channel('wsclMatrix')
-            targetwscl = itemTarget.channel('wsclMatrix')
-            sourcewscl >> targetwscl
+            pairs.append((itemSource.channel('wsclMatrix'), itemTarget.channel('wsclMatrix')))
+
+        # All channels are resolved up front so the links fire back to
+        # back with no channel lookups in between. Links that are in
+        # place already are skipped, relinking disconnects and
+        # reconnects under the hood.
+        for sourceChannel, targetChannel in pairs:
+            if not cls._isAlreadyLinked(sourceChannel, targetChannel):
+                sourceChannel >> targetChannel
+
+    @classmethod
+    def _isAlreadyLinked(cls, sourceChannel, targetChannel):
+        """ Tests whether source channel already drives the target one.
+
+        Returns
+        -------
+        bool
+        """
+        sourceIdent = sourceChannel.item.id
+        sourceIndex = sourceChannel.index
+        for x in xrange(targetChannel.revCount):
+            upstream = targetChannel.reverse(x)
+            if upstream.index == sourceIndex and upstream.item.id == sourceIdent:
+                return True
+        return False
 
 
         